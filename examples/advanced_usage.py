@@ -7,6 +7,7 @@ custom configurations, error handling, and transcript-only extraction.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from getoutvideo import (
     GetOutVideoAPI, 
     extract_transcripts_only,
@@ -15,6 +16,12 @@ from getoutvideo import (
     GetOutVideoError
 )
 
+# Write buffer for saved transcripts; large enough for a long transcript in one go
+TRANSCRIPT_WRITE_BUFFER = 1 << 20
+
+# Characters not allowed in Windows filenames, replaced in a single pass
+FILENAME_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
 
 def two_step_processing_example():
     """
@@ -69,6 +76,7 @@ def custom_configuration_example():
     processing_config = ProcessingConfig(
         styles=["Summary", "Q&A"],
         chunk_size=30000,  # Smaller chunks for faster processing
+        chunks_per_request=2,  # Send two chunks (and one copy of the prompt) per request
         output_language="German",
         max_concurrent_requests=2  # Limit concurrent API calls
     )
@@ -125,41 +133,45 @@ def transcript_only_extraction():
     print("=== Example 4: Transcript-Only Extraction ===")
     
     # Using convenience function for transcript-only extraction
-    transcripts = extract_transcripts_only(
+    transcript = extract_transcripts_only(
         url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
         openai_api_key="your-openai-api-key-here",
         use_ai_fallback=True  # Use AI STT if YouTube transcript unavailable
     )
     
-    print(f"Extracted {len(transcripts)} transcripts:")
-    for transcript in transcripts:
-        print(f"\nTitle: {transcript.title}")
-        print(f"URL: {transcript.url}")
-        print(f"Source: {transcript.source}")
-        print(f"Length: {len(transcript.transcript_text)} characters")
-        print(f"Preview: {transcript.transcript_text[:200]}...")
-        
-        # Save transcript to file
-        filename = f"transcript_{transcript.title[:30]}.txt"
-        filename = filename.replace("/", "_").replace("\\", "_")
-        
-        with open(f"./output/{filename}", "w", encoding="utf-8") as f:
-            f.write(f"Title: {transcript.title}\n")
-            f.write(f"URL: {transcript.url}\n")
-            f.write(f"Source: {transcript.source}\n\n")
-            f.write(transcript.transcript_text)
-        
-        print(f"Saved to: ./output/{filename}")
+    print(f"\nTitle: {transcript.title}")
+    print(f"URL: {transcript.url}")
+    print(f"Source: {transcript.source}")
+    print(f"Length: {len(transcript.transcript_text)} characters")
+    print(f"Preview: {transcript.transcript_text[:200]}...")
+    
+    # Save transcript to file; the output directory is created once up front
+    output_dir = "./output"
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"transcript_{transcript.title[:30]}.txt".translate(FILENAME_TABLE)
+    output_path = os.path.join(output_dir, filename)
+    
+    # Encode the whole record once and write the bytes, skipping the text layer
+    record = (f"Title: {transcript.title}\n"
+              f"URL: {transcript.url}\n"
+              f"Source: {transcript.source}\n\n"
+              f"{transcript.transcript_text}").encode("utf-8")
+    with open(output_path, "wb", buffering=TRANSCRIPT_WRITE_BUFFER) as f:
+        f.write(record)
+    
+    print(f"Saved to: {output_path}")
 
 
 def batch_processing_example():
     """
     Example 5: Batch process multiple videos with different configurations.
+    
+    Jobs run concurrently in a thread pool; each job gets its own API instance
+    because styles and language are set on the instance's configuration.
+    Set BATCH_CONCURRENCY to change how many jobs run at once.
     """
     print("=== Example 5: Batch Processing ===")
     
-    api = GetOutVideoAPI(openai_api_key="your-openai-api-key-here")
-    
     # Define different processing jobs
     jobs = [
         {
@@ -182,26 +194,33 @@ def batch_processing_example():
         }
     ]
     
+    def run_job(job):
+        api = GetOutVideoAPI(openai_api_key="your-openai-api-key-here")
+        return api.process_youtube_url(
+            url=job["url"],
+            output_dir=job["output_dir"],
+            styles=job["styles"],
+            output_language=job["language"]
+        )
+    
     successful_jobs = 0
     total_files = 0
+    max_workers = int(os.getenv("BATCH_CONCURRENCY", "4"))
     
-    for i, job in enumerate(jobs, 1):
-        try:
-            print(f"\nProcessing job {i}/{len(jobs)}: {job['url']}")
-            
-            output_files = api.process_youtube_url(
-                url=job["url"],
-                output_dir=job["output_dir"],
-                styles=job["styles"],
-                output_language=job["language"]
-            )
-            
-            successful_jobs += 1
-            total_files += len(output_files)
-            print(f"Job {i} completed: {len(output_files)} files generated")
-            
-        except Exception as e:
-            print(f"Job {i} failed: {e}")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs, 1)}
+        print(f"Submitted {len(jobs)} jobs ({max_workers} at a time)")
+        
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                output_files = future.result()
+                successful_jobs += 1
+                total_files += len(output_files)
+                print(f"Job {i} completed: {len(output_files)} files generated")
+                
+            except Exception as e:
+                print(f"Job {i} failed: {e}")
     
     print(f"\nBatch processing completed:")
     print(f"  Successful jobs: {successful_jobs}/{len(jobs)}")
@@ -13,6 +13,9 @@ from getoutvideo import GetOutVideoAPI, process_youtube_video
 # Load environment variables from .env file
 load_dotenv()
 
+# Read once; every example below uses the same key
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
 def basic_single_video_example():
     """
     Example 1: Process a single YouTube video with default settings.
@@ -20,7 +23,7 @@ def basic_single_video_example():
     print("=== Example 1: Basic Single Video Processing ===")
     
     # Initialize the API with OpenAI API key from environment
-    api = GetOutVideoAPI(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    api = GetOutVideoAPI(openai_api_key=OPENAI_API_KEY)
     
     # Configure transcript extraction for Chinese language
     # This video is in Chinese, so we need to specify language preferences
@@ -49,32 +52,33 @@ def basic_single_video_example():
     # Process with AI and get detailed results
     results = api.process_with_ai(transcript, "./output", processing_config)
     
-    print(f"Generated {len(results)} files:")
-    for result in results:
-        print(f"  - {result.output_file_path}")
-    
-    # Display cost information
-    print("\n=== AI API Usage Cost Information ===")
+    # One pass over the results collects file paths, per-style costs and totals
     total_input_tokens = 0
     total_output_tokens = 0
     total_cost = 0.0
+    file_lines = []
+    cost_lines = []
     
     for result in results:
-        print(f"\nStyle: {result.style_name}")
-        print(f"  Input tokens: {result.openai_input_tokens:,}")
-        print(f"  Output tokens: {result.openai_output_tokens:,}")
-        print(f"  Processing cost: ${result.openai_cost:.6f}")
+        file_lines.append(f"  - {result.output_file_path}")
+        cost_lines.append(f"\nStyle: {result.style_name}\n"
+                          f"  Input tokens: {result.openai_input_tokens:,}\n"
+                          f"  Output tokens: {result.openai_output_tokens:,}\n"
+                          f"  Processing cost: ${result.openai_cost:.6f}")
         
         total_input_tokens += result.openai_input_tokens or 0
         total_output_tokens += result.openai_output_tokens or 0
         total_cost += result.openai_cost or 0.0
     
-    # Include transcript extraction cost if available
-    transcript_cost = 0.0
-    for transcript in transcripts:
-        if transcript.openai_cost:
-            transcript_cost += transcript.openai_cost
+    print(f"Generated {len(results)} files:")
+    print("\n".join(file_lines))
+    
+    # Display cost information
+    print("\n=== AI API Usage Cost Information ===")
+    print("\n".join(cost_lines))
     
+    # Include transcript extraction cost if available
+    transcript_cost = transcript.openai_cost or 0.0
     if transcript_cost > 0:
         print(f"\nTranscript extraction cost: ${transcript_cost:.6f}")
         total_cost += transcript_cost
@@ -93,7 +97,7 @@ def convenience_function_example():
     output_files = process_youtube_video(
         url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
         output_dir="./output",
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        openai_api_key=OPENAI_API_KEY,
         styles=["Summary", "Educational"],  # Only specific styles
         output_language="English"
     )
@@ -109,7 +113,7 @@ def custom_processing_example():
     """
     print("=== Example 3: Custom Processing Settings ===")
     
-    api = GetOutVideoAPI(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    api = GetOutVideoAPI(openai_api_key=OPENAI_API_KEY)
     
     # Process video with custom settings
     output_files = api.process_youtube_url(
@@ -22,6 +22,8 @@ Quick Usage:
 
 from typing import List, Optional, Union
 import os
+import copy
+import functools
 
 from .config import APIConfig, TranscriptConfig, ProcessingConfig, load_config_from_env
 from .models import VideoTranscript, ProcessingResult
@@ -108,9 +110,10 @@ class GetOutVideoAPI:
             print(f"DEBUG: No transcripts extracted, returning empty list")
             return []
         
-        for i, transcript in enumerate(transcripts):
-            print(f"DEBUG: Transcript {i+1}: title='{transcript.title[:50]}...', "
-                  f"text_length={len(transcript.transcript_text)}, source={transcript.source}")
+        # Emit all transcript lines with a single write
+        print("\n".join(f"DEBUG: Transcript {i+1}: title='{transcript.title[:50]}...', "
+                        f"text_length={len(transcript.transcript_text)}, source={transcript.source}"
+                        for i, transcript in enumerate(transcripts)))
         
         # Process with AI
         print(f"DEBUG: Starting AI processing...")
@@ -143,9 +146,8 @@ class GetOutVideoAPI:
             TranscriptExtractionError: If extraction fails
         """
         if config:
+            # The extractor reads this shared config object, so no need to recreate it
             self.config.transcript_config = config
-            # Recreate extractor with updated config
-            self.transcript_extractor = TranscriptExtractor(self.config)
         
         transcripts = self.transcript_extractor.extract_transcripts(url)
         return transcripts[0]  # Return single transcript for single video
@@ -173,9 +175,8 @@ class GetOutVideoAPI:
             AIProcessingError: If processing fails
         """
         if config:
+            # The processor reads this shared config object, so no need to recreate it
             self.config.processing_config = config
-            # Recreate processor with updated config
-            self.ai_processor = AIProcessor(self.config)
         
         # Convert single transcript to list for processing
         if isinstance(transcripts, VideoTranscript):
@@ -280,12 +281,20 @@ def process_youtube_video(url: str,
     return result
 
 
+@functools.lru_cache(maxsize=1)
+def _load_env_config() -> APIConfig:
+    """Read the configuration from environment variables once."""
+    return load_config_from_env()
+
+
 def load_api_from_env() -> GetOutVideoAPI:
     """
     Load API configuration from environment variables.
     
     Expects OPENAI_API_KEY and optionally GEMINI_API_KEY and LANGUAGE
-    environment variables.
+    environment variables. The environment is read on the first call; every
+    call returns a new API instance built from a copy of that configuration,
+    so settings changed through one instance never reach another.
     
     Returns:
         GetOutVideoAPI: Configured API instance
@@ -294,9 +303,12 @@ def load_api_from_env() -> GetOutVideoAPI:
         ConfigurationError: If required environment variables are missing
     """
     try:
-        config = load_config_from_env()
+        config = copy.deepcopy(_load_env_config())
         api = GetOutVideoAPI(config.openai_api_key, config.gemini_api_key)
-        api.config = config  # Use the full config with language settings
+        # Use the full config with language settings; assign the sub-configs so the
+        # extractor and processor, which share api.config, see them too
+        api.config.transcript_config = config.transcript_config
+        api.config.processing_config = config.processing_config
         return api
     except Exception as e:
         raise ConfigurationError(f"Failed to load configuration from environment: {str(e)}") from e
@@ -6,15 +6,104 @@ GUI application's GPT5ProcessingThread class.
 """
 
 import os
+import re
 import time
-from typing import List, Optional, Callable
+import asyncio
+import functools
+from datetime import datetime
+from types import MappingProxyType
+from typing import IO, Any, AsyncGenerator, Awaitable, Dict, List, Mapping, Optional, Callable, Sequence, Tuple
 import openai
+from openai.types.chat import ChatCompletionSystemMessageParam
 
 from .config import APIConfig
 from .models import VideoTranscript, ProcessingResult
 from .exceptions import AIProcessingError, OpenAIAPIError, FileOperationError
-from .prompts import text_refinement_prompts, get_available_styles, get_prompt_for_style
-from .utils import sanitize_filename, split_text_into_chunks, safe_progress_callback, safe_status_callback, ensure_directory_exists
+from .prompts import (text_refinement_prompts, get_available_styles, get_formatted_prompt,
+                      batch_output_instructions)
+from .response_cache import ResponseCache, make_cache_key_factory, CACHE_DIR_NAME
+from .utils import (sanitize_filename, split_text_into_chunks, safe_progress_callback, safe_status_callback,
+                    ensure_directory_exists, run_coroutine_sync, run_in_thread)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_model_options(model_name: str) -> Mapping[str, Any]:
+    """
+    Get the extra chat-completion parameters for a model.
+    
+    Resolved once per model name and shared by every chunk request.
+    
+    Args:
+        model_name: Name of the OpenAI model
+        
+    Returns:
+        Mapping[str, Any]: Read-only keyword arguments for ``chat.completions.create``
+    """
+    # GPT-5 models only accept the default temperature
+    if 'gpt-5' in model_name.lower():
+        return MappingProxyType({})
+    return MappingProxyType({"temperature": 0.7})
+
+
+def _make_http_client(max_connections: int) -> Any:
+    """
+    Create the pooled HTTP client shared by every request of a run.
+    
+    The pool is sized to the request concurrency limit, so warm TLS
+    connections are reused instead of being opened and dropped.
+    
+    Args:
+        max_connections: Maximum number of concurrent connections
+        
+    Returns:
+        openai.DefaultAsyncHttpxClient: HTTP client for ``openai.AsyncOpenAI``
+    """
+    # Build the limits with the SDK's own HTTP library rather than importing it directly
+    limits_type = type(openai.DEFAULT_CONNECTION_LIMITS)
+    limits = limits_type(max_connections=max_connections,
+                         max_keepalive_connections=max_connections,
+                         keepalive_expiry=openai.DEFAULT_CONNECTION_LIMITS.keepalive_expiry)
+    return openai.DefaultAsyncHttpxClient(limits=limits)
+
+
+# Upper bound on the estimated input tokens of one batched request
+BATCH_TOKEN_BUDGET = 100000
+
+# Marker lines the model emits before each part of a batched answer
+_BATCH_OUTPUT_MARKER = re.compile(r"^[ \t]*---OUTPUT (\d+)---[ \t]*$", re.MULTILINE)
+
+
+def _split_batch_output(response_text: str, count: int) -> Optional[List[str]]:
+    """
+    Split a batched answer into per-chunk outputs.
+    
+    Args:
+        response_text: Model answer containing ``---OUTPUT n---`` markers
+        count: Number of chunks that were sent in the batch
+        
+    Returns:
+        List[str]: One output per chunk, or None if the markers are not exactly 1..count
+    """
+    markers = list(_BATCH_OUTPUT_MARKER.finditer(response_text))
+    if [int(m.group(1)) for m in markers] != list(range(1, count + 1)):
+        return None
+    
+    ends = [m.start() for m in markers[1:]] + [len(response_text)]
+    return [response_text[m.end():end].strip() for m, end in zip(markers, ends)]
+
+
+def _open_output_file(path: str) -> IO[str]:
+    """Open a processed document for writing."""
+    return open(path, "w", encoding="utf-8")
+
+
+def _discard_output_file(output_file: IO[str]) -> None:
+    """Close and delete a partially written document."""
+    output_file.close()
+    try:
+        os.remove(output_file.name)
+    except OSError:
+        pass
 
 
 class AIProcessor:
@@ -45,8 +134,13 @@ class AIProcessor:
         self.config = config
         self._cancelled = False
         
-        # Configure OpenAI API
-        self.client = openai.OpenAI(api_key=config.openai_api_key)
+        # Per-run state, set while process_transcripts is running
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._cost_rates: Optional[Tuple[float, float]] = None
+        self._in_flight_requests: Optional[Dict[str, "asyncio.Future[Tuple[str, int, int]]"]] = None
+        self._run_started_at: Optional[datetime] = None
     
     def cancel(self) -> None:
         """Cancel the current processing operation."""
@@ -64,10 +158,24 @@ class AIProcessor:
         Returns:
             float: Cost in USD
         """
-        pricing = self.OPENAI_PRICING.get(model_name, self.OPENAI_PRICING.get("gpt-5"))
-        input_cost = (input_tokens / 1000000) * pricing["input"]  # OpenAI pricing is per 1M tokens
-        output_cost = (output_tokens / 1000000) * pricing["output"]  # OpenAI pricing is per 1M tokens
-        return input_cost + output_cost
+        input_rate, output_rate = self._get_cost_rates(model_name)
+        return input_tokens * input_rate + output_tokens * output_rate
+    
+    def _get_cost_rates(self, model_name: str) -> Tuple[float, float]:
+        """
+        Resolve the per-token input and output rates for a model.
+        
+        Unknown models are priced as gpt-5.
+        
+        Args:
+            model_name: Name of the OpenAI model used
+            
+        Returns:
+            Tuple[float, float]: (input_rate, output_rate) in USD per token
+        """
+        pricing = self.OPENAI_PRICING.get(model_name) or self.OPENAI_PRICING["gpt-5"]
+        # OpenAI pricing is per 1M tokens
+        return pricing["input"] / 1000000, pricing["output"] / 1000000
     
     def process_transcripts(self,
                           transcripts: List[VideoTranscript],
@@ -89,10 +197,25 @@ class AIProcessor:
         Raises:
             AIProcessingError: If processing fails
         """
+        return run_coroutine_sync(
+            self._process_transcripts_async(transcripts, output_dir, progress_callback, status_callback))
+    
+    async def _process_transcripts_async(self,
+                                         transcripts: List[VideoTranscript],
+                                         output_dir: str,
+                                         progress_callback: Optional[Callable[[int], None]] = None,
+                                         status_callback: Optional[Callable[[str], None]] = None) -> List[ProcessingResult]:
+        """
+        Process every (transcript, style) pair as a concurrent job.
+        
+        Jobs are bounded by ``processing_config.max_concurrent_jobs`` while all
+        jobs share one OpenAI client and the ``max_concurrent_requests`` limit.
+        Results are returned in (transcript, style) order.
+        """
         self._cancelled = False
         
         try:
-            ensure_directory_exists(output_dir)
+            await run_in_thread(ensure_directory_exists, output_dir)
             
             # Get styles to process
             styles_to_process = self._get_styles_to_process()
@@ -107,13 +230,9 @@ class AIProcessor:
             safe_status_callback(status_callback, 
                                f"Starting AI processing for {total_videos} transcripts with {len(styles_to_process)} styles.")
             
-            results = []
-            
+            # Chunk every transcript up front; all styles of a video share its chunks
+            jobs = []
             for video_index, transcript in enumerate(transcripts):
-                if self._cancelled:
-                    safe_status_callback(status_callback, "Processing cancelled by user.")
-                    break
-                
                 if not transcript.transcript_text:
                     safe_status_callback(status_callback,
                                        f"Skipping Video {video_index + 1}/{total_videos} "
@@ -124,41 +243,63 @@ class AIProcessor:
                 safe_status_callback(status_callback,
                                    f"\\nProcessing Video {video_index + 1}/{total_videos}: {transcript.title[:50]}...")
                 
-                word_count = len(transcript.transcript_text.split())
-                safe_status_callback(status_callback, f"Word Count: {word_count} words")
+                # Split once; the word list serves both the count and the chunker
+                words = transcript.transcript_text.split()
+                safe_status_callback(status_callback, f"Word Count: {len(words)} words")
                 safe_status_callback(status_callback, f"Chunk Size: {self.config.processing_config.chunk_size} words")
                 
                 # Split transcript into chunks
                 chunks = split_text_into_chunks(transcript.transcript_text, 
-                                              self.config.processing_config.chunk_size)
+                                              self.config.processing_config.chunk_size,
+                                              words=words)
                 
-                # Process each style for this transcript
                 for style_name in styles_to_process:
-                    if self._cancelled:
-                        break
+                    jobs.append((transcript, style_name, chunks, sanitized_title, video_index + 1))
+            
+            job_semaphore = asyncio.Semaphore(self.config.processing_config.max_concurrent_jobs)
+            self._request_semaphore = asyncio.Semaphore(self.config.processing_config.max_concurrent_requests)
+            if self.config.processing_config.response_cache_enabled:
+                self._response_cache = ResponseCache(os.path.join(output_dir, CACHE_DIR_NAME))
+            # The model is fixed for the run, so look its pricing up once
+            self._cost_rates = self._get_cost_rates(self.config.processing_config.model_name)
+            self._in_flight_requests = {}
+            # Every result of the run shares one timestamp
+            self._run_started_at = datetime.now()
+            
+            # One pooled client per run; the SDK retries 429s, 5xx and connection
+            # errors with jittered exponential backoff
+            http_client = _make_http_client(self.config.processing_config.max_concurrent_requests)
+            async with openai.AsyncOpenAI(api_key=self.config.openai_api_key,
+                                          max_retries=self.config.processing_config.max_retries,
+                                          http_client=http_client) as client:
+                self._client = client
+                try:
+                    tasks = [asyncio.ensure_future(self._run_job(job_semaphore, *job, output_dir,
+                                                                 total_videos, status_callback))
+                             for job in jobs]
                     
-                    try:
-                        start_time = time.time()
-                        result = self._process_single_transcript(transcript, style_name, chunks,
-                                                               sanitized_title, output_dir,
-                                                               video_index + 1, total_videos,
-                                                               status_callback)
-                        processing_time = time.time() - start_time
-                        
-                        if result:
-                            result.processing_time = processing_time
-                            result.chunk_count = len(chunks)
-                            results.append(result)
-                            
-                    except Exception as e:
-                        safe_status_callback(status_callback,
-                                           f"Error processing style '{style_name}' for video {video_index + 1}: {str(e)}")
-                        continue
-                
-                # Update progress
-                progress_percent = int(((video_index + 1) / total_videos) * 100)
-                safe_progress_callback(progress_callback, progress_percent)
+                    # Update progress as jobs finish, in whatever order they complete
+                    for completed_count, finished in enumerate(asyncio.as_completed(tasks), 1):
+                        await finished
+                        progress_percent = int((completed_count / len(tasks)) * 100)
+                        safe_progress_callback(progress_callback, progress_percent)
+                finally:
+                    # Requests orphaned by failed jobs must finish before the client closes
+                    orphaned = list(self._in_flight_requests.values())
+                    for request in orphaned:
+                        request.cancel()
+                    await asyncio.gather(*orphaned, return_exceptions=True)
+                    self._in_flight_requests = None
+                    self._run_started_at = None
+                    self._client = None
+                    self._request_semaphore = None
+                    self._response_cache = None
+                    self._cost_rates = None
             
+            if self._cancelled:
+                safe_status_callback(status_callback, "Processing cancelled by user.")
+            
+            results = [result for result in (task.result() for task in tasks) if result is not None]
             safe_status_callback(status_callback, f"AI processing completed. {len(results)} files generated.")
             return results
             
@@ -167,6 +308,44 @@ class AIProcessor:
             safe_status_callback(status_callback, error_msg)
             raise AIProcessingError(error_msg) from e
     
+    async def _run_job(self,
+                       job_semaphore: asyncio.Semaphore,
+                       transcript: VideoTranscript,
+                       style_name: str,
+                       chunks: Sequence[str],
+                       sanitized_title: str,
+                       video_index: int,
+                       output_dir: str,
+                       total_videos: int,
+                       status_callback: Optional[Callable[[str], None]] = None) -> Optional[ProcessingResult]:
+        """
+        Run one (transcript, style) job, reporting errors instead of raising.
+        
+        Returns:
+            ProcessingResult: Result of the job, or None if it failed or was cancelled
+        """
+        async with job_semaphore:
+            if self._cancelled:
+                return None
+            
+            try:
+                start_time = time.time()
+                result = await self._process_single_transcript(transcript, style_name, chunks,
+                                                               sanitized_title, output_dir,
+                                                               video_index, total_videos,
+                                                               status_callback)
+                processing_time = time.time() - start_time
+                
+                if result:
+                    result.processing_time = processing_time
+                    result.chunk_count = len(chunks)
+                return result
+                
+            except Exception as e:
+                safe_status_callback(status_callback,
+                                   f"Error processing style '{style_name}' for video {video_index}: {str(e)}")
+                return None
+    
     def _get_styles_to_process(self) -> List[str]:
         """Get the list of styles to process based on configuration."""
         config_styles = self.config.processing_config.styles
@@ -185,10 +364,10 @@ class AIProcessor:
         else:
             raise AIProcessingError("styles configuration must be None or a list of style names")
     
-    def _process_single_transcript(self,
+    async def _process_single_transcript(self,
                                  transcript: VideoTranscript,
                                  style_name: str,
-                                 chunks: List[str],
+                                 chunks: Sequence[str],
                                  sanitized_title: str,
                                  output_dir: str,
                                  video_index: int,
@@ -211,98 +390,273 @@ class AIProcessor:
             ProcessingResult: Result of the processing operation
         """
         try:
-            style_prompt = get_prompt_for_style(style_name)
-            full_response = ""
-            total_input_tokens = 0
-            total_output_tokens = 0
-            
-            # Process each chunk
-            for chunk_index, chunk in enumerate(chunks):
-                if self._cancelled:
-                    return None
-                
-                # Format prompt with language
-                formatted_prompt = style_prompt.replace("[Language]", self.config.processing_config.output_language)
-                full_prompt = f"{formatted_prompt}\n\n{chunk}"
-                
-                # Generate content with OpenAI GPT-5
-                try:
-                    safe_status_callback(status_callback,
-                                       f"Generating style '{style_name}' for Video {video_index}, "
-                                       f"Chunk {chunk_index + 1}/{len(chunks)}...")
-                    
-                    # Use appropriate parameters based on model
-                    if 'gpt-5' in self.config.processing_config.model_name.lower():
-                        response = self.client.chat.completions.create(
-                            model=self.config.processing_config.model_name,
-                            messages=[{"role": "user", "content": full_prompt}]
-                        )
-                    else:
-                        response = self.client.chat.completions.create(
-                            model=self.config.processing_config.model_name,
-                            messages=[{"role": "user", "content": full_prompt}],
-                            temperature=0.7
-                        )
-                    
-                    response_text = response.choices[0].message.content
-                    full_response += response_text + "\n\n"
-                    
-                    # Track token usage if available
-                    if hasattr(response, 'usage') and response.usage:
-                        total_input_tokens += response.usage.prompt_tokens or 0
-                        total_output_tokens += response.usage.completion_tokens or 0
-                        safe_status_callback(status_callback,
-                                           f"Chunk {chunk_index + 1}/{len(chunks)} tokens: "
-                                           f"input={response.usage.prompt_tokens}, "
-                                           f"output={response.usage.completion_tokens}")
-                    
-                    safe_status_callback(status_callback,
-                                       f"Chunk {chunk_index + 1}/{len(chunks)} processed for style '{style_name}'.")
-                    
-                except Exception as e:
-                    error_msg = f"OpenAI API error for chunk {chunk_index + 1}: {str(e)}"
-                    safe_status_callback(status_callback, error_msg)
-                    raise OpenAIAPIError(error_msg) from e
+            formatted_prompt = get_formatted_prompt(style_name,
+                                                    self.config.processing_config.output_language)
             
-            # Save the processed content to file
             output_filename = f"{sanitized_title} [{style_name}].md"
             output_path = os.path.join(output_dir, output_filename)
+            header = f"# {transcript.title}\n\n**Original Video URL:** {transcript.url}\n\n"
+            total_input_tokens = total_output_tokens = 0
             
+            # Chunks are requested concurrently but arrive in chunk order, so each
+            # one is appended to a .part file as soon as its predecessors are written.
+            # The file only replaces output_path once every chunk succeeded.
+            responses = self._generate_chunk_responses(formatted_prompt, style_name, chunks,
+                                                       video_index, status_callback)
+            output_file = None
+            completed = False
             try:
-                with open(output_path, "w", encoding="utf-8") as f:
-                    # Add title and URL header
-                    f.write(f"# {transcript.title}\n\n")
-                    f.write(f"**Original Video URL:** {transcript.url}\n\n")
-                    f.write(full_response.strip())
-                
-                # Calculate cost
-                openai_cost = self._calculate_openai_cost(total_input_tokens, total_output_tokens, 
-                                                        self.config.processing_config.model_name)
+                output_file = await run_in_thread(_open_output_file, f"{output_path}.part")
+                await run_in_thread(output_file.write, header)
                 
-                safe_status_callback(status_callback,
-                                   f"Saved '{style_name}' output for video {video_index} to {output_path}")
-                safe_status_callback(status_callback,
-                                   f"OpenAI usage - Input tokens: {total_input_tokens}, "
-                                   f"Output tokens: {total_output_tokens}, Cost: ${openai_cost:.6f}")
+                chunk_index = 0
+                async for response in responses:
+                    if isinstance(response, asyncio.CancelledError):
+                        return None
+                    
+                    if isinstance(response, BaseException):
+                        error_msg = f"OpenAI API error for chunk {chunk_index + 1}: {str(response)}"
+                        safe_status_callback(status_callback, error_msg)
+                        raise OpenAIAPIError(error_msg) from response
+                    
+                    response_text, input_tokens, output_tokens = response
+                    total_input_tokens += input_tokens
+                    total_output_tokens += output_tokens
+                    
+                    separator = "\n\n" if chunk_index else ""
+                    await run_in_thread(output_file.write, separator + response_text)
+                    chunk_index += 1
                 
-                return ProcessingResult(
-                    video_transcript=transcript,
-                    style_name=style_name,
-                    output_file_path=output_path,
-                    processing_time=0.0,  # Will be set by caller
-                    chunk_count=len(chunks),
-                    openai_input_tokens=total_input_tokens,
-                    openai_output_tokens=total_output_tokens,
-                    openai_cost=openai_cost
-                )
+                await run_in_thread(output_file.close)
+                await run_in_thread(os.replace, output_file.name, output_path)
+                completed = True
                 
             except IOError as e:
                 error_msg = f"Error writing file {output_path}: {str(e)}"
                 safe_status_callback(status_callback, error_msg)
                 raise FileOperationError(error_msg) from e
+            finally:
+                # Cancels any chunk requests still outstanding
+                await responses.aclose()
+                if output_file is not None and not completed:
+                    await run_in_thread(_discard_output_file, output_file)
+            
+            # Calculate cost
+            cost_rates = self._cost_rates
+            if cost_rates is None:
+                cost_rates = self._get_cost_rates(self.config.processing_config.model_name)
+            input_rate, output_rate = cost_rates
+            openai_cost = total_input_tokens * input_rate + total_output_tokens * output_rate
+            
+            safe_status_callback(status_callback,
+                               f"Saved '{style_name}' output for video {video_index} to {output_path}")
+            safe_status_callback(status_callback,
+                               f"OpenAI usage - Input tokens: {total_input_tokens}, "
+                               f"Output tokens: {total_output_tokens}, Cost: ${openai_cost:.6f}")
+            
+            return ProcessingResult(
+                video_transcript=transcript,
+                style_name=style_name,
+                output_file_path=output_path,
+                processing_time=0.0,  # Will be set by caller
+                chunk_count=len(chunks),
+                created_at=self._run_started_at,
+                openai_input_tokens=total_input_tokens,
+                openai_output_tokens=total_output_tokens,
+                openai_cost=openai_cost
+            )
             
-        except (GeminiAPIError, FileOperationError):
+        except (OpenAIAPIError, FileOperationError):
             raise
         except Exception as e:
             error_msg = f"Error processing transcript with style '{style_name}': {str(e)}"
-            raise AIProcessingError(error_msg) from e
\ No newline at end of file
+            raise AIProcessingError(error_msg) from e
+    
+    async def _generate_chunk_responses(self,
+                                        formatted_prompt: str,
+                                        style_name: str,
+                                        chunks: Sequence[str],
+                                        video_index: int,
+                                        status_callback: Optional[Callable[[str], None]] = None
+                                        ) -> AsyncGenerator[Any, None]:
+        """
+        Send every chunk of a transcript to OpenAI concurrently.
+        
+        Requests go through the run's shared client and are bounded by the
+        run-wide ``processing_config.max_concurrent_requests`` semaphore. When
+        ``processing_config.chunks_per_request`` is above 1, consecutive chunks
+        are packed into one request (up to ``BATCH_TOKEN_BUDGET`` estimated
+        input tokens) and the delimited answer is split back into
+        per-chunk outputs; if the answer cannot be split, those chunks are
+        re-sent one by one. Closing the generator cancels any requests that
+        are still outstanding.
+        
+        Args:
+            formatted_prompt: Style prompt with the output language filled in
+            style_name: Name of the processing style
+            chunks: List of text chunks to process
+            video_index: Current video index (1-based)
+            status_callback: Optional callback for status messages
+            
+        Yields:
+            One ``(text, input_tokens, output_tokens)`` tuple per chunk, in
+            chunk order. Failed chunks hold the raised exception; cancelled
+            chunks hold ``asyncio.CancelledError``. Cached chunks report zero
+            tokens, and a batch's tokens are attributed to its first chunk.
+        """
+        model_name = self.config.processing_config.model_name
+        model_options = _get_model_options(model_name)
+        chunks_per_request = self.config.processing_config.chunks_per_request
+        client = self._client
+        semaphore = self._request_semaphore
+        response_cache = self._response_cache
+        in_flight = self._in_flight_requests
+        # Only called from _run_job, while process_transcripts holds the run state
+        assert client is not None and semaphore is not None and in_flight is not None
+        total_chunks = len(chunks)
+        # Status messages are only formatted when someone is listening
+        has_status = status_callback is not None
+        
+        def _make_chunk_runner(prompt: str):
+            # Specialize the request path for one prompt: its cache-key hash state
+            # and system message are built once, not per chunk. Keeping the prompt
+            # in an identical system message also lets OpenAI cache the prefix.
+            cache_key_for = make_cache_key_factory(model_name, prompt)
+            system_message: ChatCompletionSystemMessageParam = {"role": "system", "content": prompt}
+            
+            async def _run(content: str, label: str):
+                if self._cancelled:
+                    raise asyncio.CancelledError()
+                
+                # Identical requests already in flight (e.g. a chunk repeated across
+                # videos) share one API call; only the first caller is billed for it
+                cache_key = cache_key_for(content)
+                pending = in_flight.get(cache_key)
+                if pending is not None:
+                    response_text, _, _ = await asyncio.shield(pending)
+                    if has_status:
+                        safe_status_callback(status_callback,
+                                           f"{label} for style '{style_name}' shared an identical request.")
+                    return response_text, 0, 0
+                
+                pending = asyncio.ensure_future(_fetch(cache_key, content, label))
+                in_flight[cache_key] = pending
+                pending.add_done_callback(lambda _: in_flight.pop(cache_key, None))
+                return await asyncio.shield(pending)
+            
+            async def _fetch(cache_key: str, content: str, label: str):
+                # Cache hits skip the API entirely and cost nothing
+                if response_cache is not None:
+                    cached = await run_in_thread(response_cache.get, cache_key)
+                    if cached is not None:
+                        if has_status:
+                            safe_status_callback(status_callback,
+                                               f"{label} for style '{style_name}' served from cache.")
+                        return cached[0], 0, 0
+                
+                async with semaphore:
+                    if self._cancelled:
+                        raise asyncio.CancelledError()
+                    
+                    if has_status:
+                        safe_status_callback(status_callback,
+                                           f"Generating style '{style_name}' for Video {video_index}, {label}...")
+                    
+                    response = await client.chat.completions.create(
+                        model=model_name,
+                        messages=[system_message, {"role": "user", "content": content}],
+                        **model_options
+                    )
+                
+                response_text = response.choices[0].message.content or ""
+                input_tokens = output_tokens = 0
+                if response.usage:
+                    input_tokens = response.usage.prompt_tokens or 0
+                    output_tokens = response.usage.completion_tokens or 0
+                
+                if response_cache is not None:
+                    await run_in_thread(response_cache.set, cache_key, response_text, input_tokens, output_tokens)
+                
+                # Track token usage if available
+                if has_status and (input_tokens or output_tokens):
+                    safe_status_callback(status_callback,
+                                       f"{label} tokens: "
+                                       f"input={input_tokens}, "
+                                       f"output={output_tokens}")
+                return response_text, input_tokens, output_tokens
+            
+            return _run
+        
+        run_chunk = _make_chunk_runner(formatted_prompt)
+        batch_runners: Dict[int, Callable[[str, str], Awaitable[Tuple[str, int, int]]]] = {}
+        
+        async def _process_chunk(chunk_index: int):
+            label = f"Chunk {chunk_index + 1}/{total_chunks}" if has_status else ""
+            result = await run_chunk(chunks[chunk_index], label)
+            if has_status:
+                safe_status_callback(status_callback, f"{label} processed for style '{style_name}'.")
+            return [result]
+        
+        async def _process_batch(chunk_indices: List[int]):
+            count = len(chunk_indices)
+            run_batch = batch_runners.get(count)
+            if run_batch is None:
+                run_batch = batch_runners[count] = _make_chunk_runner(
+                    f"{batch_output_instructions.format(count=count)}\n\n{formatted_prompt}")
+            batch_content = "\n".join(f"---CHUNK {n}---\n{chunks[i]}"
+                                      for n, i in enumerate(chunk_indices, 1))
+            label = (f"Chunks {chunk_indices[0] + 1}-{chunk_indices[-1] + 1}/{total_chunks}"
+                     if has_status else "")
+            
+            response_text, input_tokens, output_tokens = await run_batch(batch_content, label)
+            outputs = _split_batch_output(response_text, count)
+            if outputs is None:
+                if has_status:
+                    safe_status_callback(status_callback,
+                                       f"{label} for style '{style_name}': batched answer could not be split, "
+                                       f"sending chunks individually.")
+                results = await asyncio.gather(*[_process_chunk(i) for i in chunk_indices])
+                fallback = [result for chunk_results in results for result in chunk_results]
+                # The unsplittable batched call was still billed
+                text, fallback_input, fallback_output = fallback[0]
+                fallback[0] = (text, fallback_input + input_tokens, fallback_output + output_tokens)
+                return fallback
+            
+            if has_status:
+                safe_status_callback(status_callback, f"{label} processed for style '{style_name}'.")
+            return ([(outputs[0], input_tokens, output_tokens)] +
+                    [(text, 0, 0) for text in outputs[1:]])
+        
+        # Pack consecutive chunks while the batch stays within its size and token budget
+        groups: List[List[int]] = []
+        group_tokens = 0
+        for chunk_index, chunk in enumerate(chunks):
+            # About four characters per token
+            chunk_tokens = len(chunk) // 4 if chunks_per_request > 1 else 0
+            if (groups and len(groups[-1]) < chunks_per_request
+                    and group_tokens + chunk_tokens <= BATCH_TOKEN_BUDGET):
+                groups[-1].append(chunk_index)
+                group_tokens += chunk_tokens
+            else:
+                groups.append([chunk_index])
+                group_tokens = chunk_tokens
+        tasks = [asyncio.ensure_future(_process_chunk(g[0]) if len(g) == 1 else _process_batch(g))
+                 for g in groups]
+        
+        try:
+            # Tasks run concurrently; results are handed out in chunk order
+            for group, task in zip(groups, tasks):
+                try:
+                    results = await task
+                except asyncio.CancelledError:
+                    if not self._cancelled:
+                        raise
+                    results = [asyncio.CancelledError()] * len(group)
+                except Exception as e:
+                    results = [e] * len(group)
+                for result in results:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
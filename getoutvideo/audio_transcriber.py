@@ -10,10 +10,9 @@ to clean up temporary audio files.
 Dependencies:
 - Python 3.x
 - yt-dlp: For downloading YouTube audio (`pip install yt-dlp`)
-- pydub: For audio manipulation and segmentation (`pip install pydub`)
 - openai: Official OpenAI Python client (`pip install openai`)
 - ffmpeg-python: Python bindings for FFmpeg (`pip install ffmpeg-python`)
-- ffmpeg: Required by pydub, yt-dlp, and ffmpeg-python for audio processing. Must be installed
+- ffmpeg: Required by yt-dlp and ffmpeg-python for audio processing (ffprobe is used for durations). Must be installed
   and accessible in the system's PATH. (Download from https://ffmpeg.org/)
 
 Environment Variables:
@@ -33,13 +32,19 @@ directory as the script, where the final transcript file and intermediate
 audio files (if not cleaned up) will be stored.
 """
 
-from pydub import AudioSegment
-import re, os, subprocess
+import re, os, shutil, subprocess
+import hashlib
 from pathlib import Path
 import yt_dlp
-from openai import OpenAI
+from openai import OpenAI, DefaultHttpxClient, DEFAULT_CONNECTION_LIMITS
 import ffmpeg
 import sys
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 
 # Import centralized URLs
 try:
@@ -48,6 +53,69 @@ except ImportError:
     # Fallback if not available
     FALLBACK_TEST_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
+try:
+    from .response_cache import ResponseCache, make_file_cache_key
+except ImportError:
+    # Running as a standalone script: transcripts are not cached
+    ResponseCache = None  # type: ignore[misc,assignment]
+
+# OpenAI model used to transcribe audio chunks
+TRANSCRIPTION_MODEL = "gpt-4o-transcribe"
+
+# Chunk transcript cache directory, relative to the user's cache directory; it must
+# outlive the audio, which may sit in a temp directory removed after each video
+TRANSCRIPT_CACHE_DIR_NAME = os.path.join("getoutvideo", "transcriptions")
+
+# Upper bound on chunk transcription requests sent to OpenAI at once
+MAX_TRANSCRIPTION_WORKERS = 8
+
+# Directory under the system temp dir holding one subdirectory of audio per video
+# when no transcript path is given
+AUDIO_TEMP_DIR_NAME = "getoutvideo_audio"
+
+# Number of videos whose audio may be downloaded ahead of transcription
+DOWNLOAD_PREFETCH = 2
+
+# DASH fragments yt-dlp fetches in parallel for one video
+CONCURRENT_FRAGMENT_DOWNLOADS = 4
+
+# Existing audio files this small are leftovers of an interrupted download
+MIN_AUDIO_FILE_BYTES = 1024
+
+# Hide the console window of ffmpeg/ffprobe subprocesses on Windows
+CREATION_FLAGS = 0
+if sys.platform == "win32":
+    CREATION_FLAGS = subprocess.CREATE_NO_WINDOW
+
+# Longest audio chunk sent in one transcription request (10 minutes)
+MAX_CHUNK_SECONDS = 600
+
+# Files below this size (OpenAI's 25 MB upload limit, with margin) may be sent whole
+DIRECT_UPLOAD_MAX_BYTES = 24 * 1024 * 1024
+
+# Content types sent with uploaded audio chunks, by file extension
+AUDIO_CONTENT_TYPES = {".m4a": "audio/mp4", ".ogg": "audio/ogg"}
+
+# Chunk encodings tried in order: (extension, segment format, ffmpeg codec args,
+# whether it re-encodes). Speech stays intelligible as 16 kHz mono Opus at
+# 16 kbps, an upload several times smaller than the downloaded AAC; stream copy
+# is the fallback. Bitexact output makes re-runs produce identical chunk files,
+# so their cached transcripts are found again.
+CHUNK_ENCODINGS = (
+    (".ogg", "ogg", ['-ac', '1', '-ar', '16000', '-c:a', 'libopus', '-b:a', '16k',
+                     '-flags:a', '+bitexact', '-fflags', '+bitexact'], True),
+    (".m4a", "ipod", ['-c', 'copy', '-fflags', '+bitexact'], False),
+)
+
+# Sample rate the audio is reduced to before silence detection
+SILENCE_DETECT_SAMPLE_RATE = 16000
+
+# Characters replaced by '_' when a video title is used as a file name
+_FILENAME_TRANSLATION = str.maketrans(dict.fromkeys('\\/*?:"<>|', '_'))
+
+# Matches the "silence_start: 12.3" / "silence_end: 15.1" lines logged by silencedetect
+_SILENCE_RE = re.compile(r'silence_(start|end):\s*([\d.]+)')
+
 
 # Placeholder function for AI-based Speech-to-Text
 def get_transcript_with_ai_stt(video_url, video_title, cookie_path, transcript_file_path, cleanup_intermediate_files=False):
@@ -59,8 +127,11 @@ def get_transcript_with_ai_stt(video_url, video_title, cookie_path, transcript_f
         video_url (str): The URL of the YouTube video.
         video_title (str): A clean title for the video, used for naming files.
         cookie_path (str or None): Path to the cookie file for yt-dlp authentication.
-        transcript_file_path (str): The desired path for the final transcript text file.
+        transcript_file_path (str or None): The desired path for the final transcript text file,
+                                    written chunk by chunk as transcripts arrive.
                                     The audio and chunks will be placed in its parent directory.
+                                    If None, no file is written and the audio goes to a
+                                    per-video directory under the system temp dir.
         cleanup_intermediate_files (bool): If True, delete the downloaded audio and chunks
                                            after processing. Defaults to False.
 
@@ -71,6 +142,116 @@ def get_transcript_with_ai_stt(video_url, video_title, cookie_path, transcript_f
     print(f"--- Starting transcription process for: {video_title} ---")
     
     # 1. Determine paths
+    paths = _resolve_audio_paths(video_url, video_title, transcript_file_path)
+    if paths is None:
+        return None
+    output_dir, audio_path = paths
+
+    # 2. Download audio - Pass cookie_path here
+    downloaded = download_youtube_audio(video_url, str(audio_path), cookie_path=cookie_path)
+    return _transcribe_downloaded_audio(video_url, audio_path, output_dir, downloaded,
+                                        cleanup_intermediate_files, transcript_file_path)
+
+
+def get_transcripts_with_ai_stt(jobs, cookie_path, cleanup_intermediate_files=False):
+    """
+    Transcribes several videos, downloading upcoming audio while the current
+    video is segmented and transcribed.
+
+    Downloads are network-bound while segmentation and transcription wait on
+    ffmpeg and the OpenAI API, so the two stages overlap. At most
+    DOWNLOAD_PREFETCH downloads run ahead of transcription to bound disk usage.
+
+    Args:
+        jobs (list): (video_url, video_title, transcript_file_path) tuples, with the
+                     same meaning as the arguments of get_transcript_with_ai_stt.
+        cookie_path (str or None): Path to the cookie file for yt-dlp authentication.
+        cleanup_intermediate_files (bool): If True, delete each video's downloaded audio
+                                           and chunks after processing. Defaults to False.
+
+    Returns:
+        list: One result per job, in job order, as returned by get_transcript_with_ai_stt.
+              A job that raises is recorded as (None, None).
+    """
+    job_iter = iter(jobs)
+    results = []
+    # The executor exits first, so the shared yt-dlp instance outlives every download
+    with ExitStack() as stack, ThreadPoolExecutor(max_workers=1) as downloader:
+        # One yt-dlp instance serves every download; the single worker keeps it single-threaded
+        download = _make_downloader(stack, cookie_path)
+        pending = deque(downloader.submit(_download_stage, job, download)
+                        for job in islice(job_iter, DOWNLOAD_PREFETCH))
+        while pending:
+            future = pending.popleft()
+            # Start the next download before working on this one
+            for job in islice(job_iter, 1):
+                pending.append(downloader.submit(_download_stage, job, download))
+            # A failing video is recorded as failed instead of aborting the batch
+            try:
+                video_url, transcript_file_path, paths, downloaded = future.result()
+                if paths is None:
+                    results.append(None)
+                    continue
+                output_dir, audio_path = paths
+                results.append(_transcribe_downloaded_audio(video_url, audio_path, output_dir, downloaded,
+                                                            cleanup_intermediate_files, transcript_file_path))
+            except Exception as e:
+                print(f"Error transcribing a batch job: {e}")
+                results.append((None, None))
+    return results
+
+
+def _transcript_cache_dir():
+    """
+    Returns the directory of the chunk transcript cache.
+
+    Returns:
+        str: TRANSCRIPT_CACHE_DIR_NAME under %LOCALAPPDATA% on Windows, or under
+             $XDG_CACHE_HOME (default ~/.cache) elsewhere.
+    """
+    if sys.platform == "win32":
+        cache_root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_root, TRANSCRIPT_CACHE_DIR_NAME)
+
+
+def _audio_temp_dir(video_url):
+    """
+    Returns the temp directory holding a video's audio when no transcript path is given.
+
+    The directory is keyed on the video URL rather than the title, which different
+    videos may share, so an earlier download of the same video can be reused.
+
+    Args:
+        video_url (str): The URL of the YouTube video.
+
+    Returns:
+        str: {system temp dir}/AUDIO_TEMP_DIR_NAME/{hash of the URL}
+    """
+    video_key = hashlib.blake2b(video_url.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), AUDIO_TEMP_DIR_NAME, video_key)
+
+
+def _resolve_audio_paths(video_url, video_title, transcript_file_path):
+    """
+    Works out where a video's audio and chunks are stored.
+
+    Args:
+        video_url (str): The URL of the YouTube video.
+        video_title (str): A clean title for the video, used for naming files.
+        transcript_file_path (str or None): The desired path for the final transcript text file.
+                                            None stores the audio in the video's
+                                            _audio_temp_dir().
+
+    Returns:
+        tuple: (output_dir, audio_path) as Path objects, or None if the path is invalid.
+    """
+    if transcript_file_path is None:
+        # API callers only want the text
+        temp_dir = _audio_temp_dir(video_url)
+        os.makedirs(temp_dir, exist_ok=True)
+        transcript_file_path = os.path.join(temp_dir, "transcript.txt")
     # Ensure transcript_file_path is a string before using Path
     if not isinstance(transcript_file_path, str):
         print(f"Error: transcript_file_path must be a string, got {type(transcript_file_path)}")
@@ -82,51 +263,93 @@ def get_transcript_with_ai_stt(video_url, video_title, cookie_path, transcript_f
          return None
 
     # Sanitize video_title for use in filename (replace invalid chars)
-    safe_video_title = re.sub(r'[\\/*?:"<>|]', "_", video_title) # Basic sanitization
+    safe_video_title = video_title.translate(_FILENAME_TRANSLATION) # Basic sanitization
     audio_filename = f"{safe_video_title}.m4a"
     audio_path = output_dir / audio_filename
-    chunk_paths = [] # Initialize chunk_paths in case segmentation fails
-    audio_duration_minutes = 0.0
 
     print(f"Output directory: {output_dir}")
     print(f"Target audio path: {audio_path}")
+    return output_dir, audio_path
+
+
+def _download_stage(job, download):
+    """
+    Resolves paths for one job and downloads its audio.
+
+    Args:
+        job (tuple): (video_url, video_title, transcript_file_path).
+        download (callable): Download function from _make_downloader().
+
+    Returns:
+        tuple: (video_url, transcript_file_path, paths, downloaded) where paths comes
+               from _resolve_audio_paths.
+    """
+    video_url, video_title, transcript_file_path = job
+    print(f"--- Starting transcription process for: {video_title} ---")
+    paths = _resolve_audio_paths(video_url, video_title, transcript_file_path)
+    if paths is None:
+        return video_url, transcript_file_path, None, False
+    downloaded = download(video_url, str(paths[1]))
+    return video_url, transcript_file_path, paths, downloaded
+
+
+def _transcribe_downloaded_audio(video_url, audio_path, output_dir, downloaded, cleanup_intermediate_files,
+                                 transcript_file_path=None):
+    """
+    Segments and transcribes a downloaded audio file, then optionally cleans up.
+
+    Args:
+        video_url (str): The URL of the YouTube video, used in messages.
+        audio_path (Path): Path of the downloaded audio.
+        output_dir (Path): Directory the chunks are written to.
+        downloaded (bool): Whether the download succeeded.
+        cleanup_intermediate_files (bool): If True, delete the audio and chunks afterwards.
+        transcript_file_path (str, optional): File the transcript is streamed to, if any.
+
+    Returns:
+        tuple: (combined_transcript_text, duration_in_minutes) if successful,
+               (None, None) if failed.
+    """
+    chunk_paths = [] # Initialize chunk_paths in case segmentation fails
+    audio_duration_minutes = 0.0
 
     # Use a try...finally block to ensure cleanup happens even if errors occur *after* file creation
     try:
-        # 2. Download audio - Pass cookie_path here
-        if not download_youtube_audio(video_url, str(audio_path), cookie_path=cookie_path):
+        if not downloaded:
             print(f"Failed to download audio for {video_url}. Aborting.")
             return None, None # No files to clean up if download fails
 
-        # Get audio duration for cost calculation
-        try:
-            audio = AudioSegment.from_file(str(audio_path))
-            audio_duration_minutes = len(audio) / 1000 / 60  # Convert ms to minutes
+        # Get audio duration for cost calculation (read from the container, no decode)
+        duration_sec = get_audio_duration(str(audio_path))
+        if duration_sec is not None:
+            audio_duration_minutes = duration_sec / 60
             print(f"Audio duration: {audio_duration_minutes:.2f} minutes")
-        except Exception as e:
-            print(f"Warning: Could not get audio duration: {e}")
-
-        # 3. Segment audio
-        print(f"Segmenting audio file: {audio_path}")
-        chunk_paths = audio_segmentation(str(audio_path), str(output_dir))
-        if not chunk_paths:
-            print("Audio segmentation failed or produced no chunks.")
-            # Don't return immediately, allow cleanup
         else:
-            print(f"Created {len(chunk_paths)} audio chunks.")
+            print("Warning: Could not get audio duration")
+
+        # 3. Segment audio - unless the whole file can be uploaded as one chunk
+        if fits_single_upload(str(audio_path), duration_sec):
+            print(f"Audio fits a single upload, skipping segmentation: {audio_path}")
+            upload_paths = [str(audio_path)]
+        else:
+            print(f"Segmenting audio file: {audio_path}")
+            chunk_paths = audio_segmentation(str(audio_path), str(output_dir), duration_sec)
+            if not chunk_paths:
+                print("Audio segmentation failed or produced no chunks.")
+                # Don't return immediately, allow cleanup
+            else:
+                print(f"Created {len(chunk_paths)} audio chunks.")
+            upload_paths = chunk_paths
 
         # 4. Transcribe each chunk (using OpenAI) - Only if chunks were created
         all_transcripts = []
-        if chunk_paths:
+        if upload_paths:
             print("Transcribing chunks using OpenAI gpt-4o-transcribe...")
-            for i, chunk_path in enumerate(chunk_paths):
-                print(f"Processing chunk {i+1}/{len(chunk_paths)}: {chunk_path}")
-                transcript_text = transcribe_audio_chunk_openai(chunk_path)
-                if transcript_text:
-                    all_transcripts.append(transcript_text)
-                else:
-                    print(f"Warning: Transcription failed for chunk {chunk_path}")
-                    all_transcripts.append(f"[Transcription failed for {os.path.basename(chunk_path)}]\n")
+            # Re-runs reuse transcripts of chunks whose bytes have not changed
+            cache = None
+            if ResponseCache is not None:
+                cache = ResponseCache(_transcript_cache_dir())
+            all_transcripts = _transcribe_to_file(upload_paths, transcript_file_path, cache)
         else:
             print("Skipping transcription as no audio chunks were created.")
             return None, None # If no chunks, no transcript can be generated
@@ -143,33 +366,27 @@ def get_transcript_with_ai_stt(video_url, video_title, cookie_path, transcript_f
         if cleanup_intermediate_files:
             print("\n--- Cleaning up intermediate files ---")
             # Clean up original audio
-            if os.path.exists(audio_path):
-                try:
-                    print(f"Deleting original audio: {audio_path}")
-                    os.remove(audio_path)
-                except OSError as e:
-                    print(f"Error deleting original audio {audio_path}: {e}")
-            else:
+            try:
+                os.unlink(audio_path)
+                print(f"Deleted original audio: {audio_path}")
+            except FileNotFoundError:
                  # This might happen if download failed but we still entered the finally block
                  print(f"Original audio not found for cleanup: {audio_path}")
+            except OSError as e:
+                print(f"Error deleting original audio {audio_path}: {e}")
 
-
-            # Clean up chunks
-            if chunk_paths:
-                print(f"Deleting {len(chunk_paths)} chunks...")
-                deleted_count = 0
-                for chunk_path in chunk_paths:
-                    if os.path.exists(chunk_path):
-                        try:
-                            os.remove(chunk_path)
-                            deleted_count += 1
-                        except OSError as e:
-                            print(f"Error deleting chunk {chunk_path}: {e}")
-                    else:
-                        print(f"Chunk not found for cleanup: {chunk_path}")
-                print(f"Deleted {deleted_count} chunk files.")
+            # Clean up chunks; they all live in one directory of their own
+            chunks_dir = chunks_dir_for(str(audio_path), str(output_dir))
+            if os.path.isdir(chunks_dir):
+                shutil.rmtree(chunks_dir, ignore_errors=True)
+                print(f"Deleted chunk directory with {len(chunk_paths)} chunks: {chunks_dir}")
             else:
-                print("No chunk paths recorded for cleanup.")
+                print("No chunk directory to clean up.")
+
+            # A video directory under the temp dir was created by _resolve_audio_paths
+            if Path(output_dir).parent == Path(tempfile.gettempdir(), AUDIO_TEMP_DIR_NAME):
+                shutil.rmtree(output_dir, ignore_errors=True)
+                print(f"Deleted temporary audio directory: {output_dir}")
             print("--- Cleanup finished ---")
         else:
             print("\n--- Skipping cleanup of intermediate files ---")
@@ -180,6 +397,9 @@ def detect_silence(audio_path, noise_thresh='-30dB', min_silence_len=1.5):
     Detects silence segments in an audio file using ffmpeg's silence detection filter
     via the ffmpeg-python library.
 
+    ffmpeg's log is parsed line by line as it is produced rather than buffered
+    until the process exits; the events are paired by pair_silence_events.
+
     Args:
         audio_path (str): Path to the audio file to analyze.
         noise_thresh (str): Noise threshold in dB for silence detection (default: '-30dB').
@@ -188,34 +408,34 @@ def detect_silence(audio_path, noise_thresh='-30dB', min_silence_len=1.5):
     Returns:
         list: A list of tuples containing (start_time, end_time) for each detected silence segment.
     """
-    # Set creation flags to hide console window only on Windows
-    creation_flags = 0
-    if sys.platform == "win32":
-        creation_flags = subprocess.CREATE_NO_WINDOW
+    # Use ffmpeg-python to build the command; output goes to the null muxer.
+    # Silence only needs a coarse energy envelope, so the audio is downmixed to
+    # mono at 16 kHz first, shrinking the samples silencedetect has to scan.
+    command = (
+        ffmpeg
+        .input(audio_path, vn=None, sn=None, dn=None)
+        .filter('aformat', channel_layouts='mono', sample_rates=SILENCE_DETECT_SAMPLE_RATE)
+        .filter('silencedetect', noise=noise_thresh, d=min_silence_len)
+        .output('-', format='null')
+        .global_args('-hide_banner', '-nostats')
+        .compile()
+    )
 
+    # (time, kind) events; parsed as ffmpeg logs them and paired once it is done
+    events = []
+    # Last log lines, reported if ffmpeg fails
+    log_tail = deque(maxlen=20)
     try:
-        # Use ffmpeg-python to build and run the command
-        # quiet=True suppresses ffmpeg's own logs but not silencedetect output to stderr
-        out, err = (
-            ffmpeg
-            .input(audio_path)
-            .filter('silencedetect', noise=noise_thresh, d=min_silence_len)
-            .output('-', format='null') # Output to null device
-            # Pass the creationflags if on Windows
-            .run(capture_stdout=True, capture_stderr=True, quiet=True, creationflags=creation_flags)
-        )
         # silencedetect logs to stderr
-        stderr = err.decode('utf-8', errors='ignore')
-
-    except ffmpeg.Error as e:
-        # Log the error output from ffmpeg if it fails
-        print(f"ffmpeg-python error during silence detection:")
-        # Try decoding stderr for more detailed error info
-        try:
-            print(e.stderr.decode('utf-8', errors='ignore'))
-        except Exception: # If decoding stderr itself fails
-             print("Could not decode ffmpeg stderr.")
-        return []
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, errors='ignore', creationflags=CREATION_FLAGS)
+        with process:
+            for line in process.stderr:
+                log_tail.append(line)
+                match = _SILENCE_RE.search(line)
+                if match is not None:
+                    kind, value = match.groups()
+                    events.append((float(value), kind))
     except FileNotFoundError:
         # Handle case where ffmpeg executable is not found
         print("Error: ffmpeg executable not found. Make sure ffmpeg is installed and in your PATH.")
@@ -225,22 +445,41 @@ def detect_silence(audio_path, noise_thresh='-30dB', min_silence_len=1.5):
         print(f"An unexpected error occurred during silence detection: {e}")
         return []
 
-    # Parse the stderr output for silence markers (same logic as before)
-    pattern = r'silence_start: ([\d.]+)|silence_end: ([\d.]+)'
-    events = re.findall(pattern, stderr)
+    if process.returncode != 0:
+        # Log the error output from ffmpeg if it fails
+        print(f"ffmpeg error during silence detection:")
+        print("".join(log_tail))
+        return []
+
+    return pair_silence_events(events)
+
+
+def pair_silence_events(events):
+    """
+    Turns silencedetect start/end events into ordered, non-overlapping intervals.
+
+    ffmpeg normally logs events in order, but across complex streams they can
+    arrive out of order or unmatched. Sorting them once by time (an end sorts
+    before a start at the same instant) lets a single pass pair each end with
+    the latest unmatched start.
 
+    Args:
+        events (list): (time_in_seconds, 'start' | 'end') tuples, in any order.
+
+    Returns:
+        list: (start_time, end_time) tuples sorted by start time.
+    """
     silences = []
     current_start = None
-    for start, end in events:
-        if start:
-            current_start = float(start)
-        elif end and current_start is not None:
+    for time_sec, kind in sorted(events):
+        if kind == 'start':
+            current_start = time_sec
+        elif current_start is not None:
             # Handle potential edge case where end time might be slightly before start time due to precision
-            end_time = float(end)
-            if end_time > current_start:
-                 silences.append((current_start, end_time))
+            if time_sec > current_start:
+                 silences.append((current_start, time_sec))
             else:
-                 print(f"Warning: Detected silence end time ({end_time}) not after start time ({current_start}). Skipping this interval.")
+                 print(f"Warning: Detected silence end time ({time_sec}) not after start time ({current_start}). Skipping this interval.")
             current_start = None # Reset regardless of whether it was added
 
     # Handle case where audio might end during a silence detection
@@ -250,134 +489,327 @@ def detect_silence(audio_path, noise_thresh='-30dB', min_silence_len=1.5):
         # Option: Add it assuming it ends at audio duration? Requires getting audio duration.
         # For now, we'll just ignore silences that don't have an end marker.
 
-
     return silences
 
 
-def audio_segmentation(audio_path, output_dir):
+def get_audio_duration(audio_path):
+    """
+    Reads an audio file's duration from its container metadata with ffprobe.
+
+    Args:
+        audio_path (str): Path to the audio file.
+
+    Returns:
+        float: Duration in seconds, or None if it could not be determined.
+    """
+    command = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        audio_path,
+    ]
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True,
+                                creationflags=CREATION_FLAGS)
+        return float(result.stdout.strip())
+    except FileNotFoundError:
+        print("Error: ffprobe executable not found. Make sure ffmpeg is installed and in your PATH.")
+    except (subprocess.CalledProcessError, ValueError) as e:
+        print(f"Could not read duration of {audio_path}: {e}")
+    return None
+
+
+def fits_single_upload(audio_path, duration_sec):
+    """
+    Checks whether an audio file can be transcribed without segmentation.
+
+    Args:
+        audio_path (str): Path to the audio file.
+        duration_sec (float or None): Duration from get_audio_duration(), None if unknown.
+
+    Returns:
+        bool: True if the file is under DIRECT_UPLOAD_MAX_BYTES and no longer than
+              MAX_CHUNK_SECONDS.
+    """
+    try:
+        if os.path.getsize(audio_path) >= DIRECT_UPLOAD_MAX_BYTES:
+            return False
+    except OSError:
+        return False
+    return duration_sec is not None and duration_sec <= MAX_CHUNK_SECONDS
+
+
+def chunks_dir_for(audio_path, output_dir):
+    """
+    Returns the directory holding an audio file's chunks.
+
+    Args:
+        audio_path (str): Path to the segmented audio file.
+        output_dir (str): Directory passed to audio_segmentation.
+
+    Returns:
+        str: {output_dir}/{base_name}_chunks
+    """
+    return os.path.join(output_dir, f"{Path(audio_path).stem}_chunks")
+
+
+def audio_segmentation(audio_path, output_dir, duration_sec=None):
     """
     Segments an audio file into chunks based on silence detection and duration limits.
     
     Args:
         audio_path (str): Path to the input audio file to be segmented.
-        output_dir (str): Directory where the audio chunks will be saved.
+        output_dir (str): Directory whose chunks_dir_for() subdirectory receives the chunks.
+        duration_sec (float, optional): Duration of the file if already known; probed
+                                        with ffprobe otherwise.
         
     Returns:
         list: A list of file paths for the created audio chunks.
         
     Output:
-        Creates numbered m4a files ({base_name}_chunk_XX.m4a) in the specified output_dir.
+        Creates numbered chunk files (XX.ogg, 16 kHz mono Opus) in {output_dir}/{base_name}_chunks,
+        so cleanup can remove them with one rmtree and videos never share a chunk name.
+        Falls back to stream-copied m4a chunks if ffmpeg has no libopus encoder.
     """
-    # --- Start Monkey Patch to suppress ffmpeg console window ---
-    original_popen = subprocess.Popen
-    if sys.platform == "win32":
-        # Define a wrapper for Popen that adds CREATE_NO_WINDOW
-        def patched_popen(*args, **kwargs):
-            creationflags = kwargs.get('creationflags', 0)
-            # Add the flag to prevent console window
-            kwargs['creationflags'] = creationflags | subprocess.CREATE_NO_WINDOW
-            # Call the original Popen with modified kwargs
-            return original_popen(*args, **kwargs)
-        # Replace the global Popen with our patched version
-        subprocess.Popen = patched_popen
-    # --- End Monkey Patch Setup ---
+    # Ensure the chunk directory exists
+    chunks_dir = chunks_dir_for(audio_path, output_dir)
+    Path(chunks_dir).mkdir(parents=True, exist_ok=True)
+
+    # Read the duration from the container instead of decoding the whole file
+    if duration_sec is None:
+        duration_sec = get_audio_duration(audio_path)
+    if duration_sec is None:
+        print(f"Error loading audio file {audio_path}: could not read its duration")
+        return [] # Exit early if probing fails
+
+    # Detect silence and get timestamps
+    silences = detect_silence(audio_path, min_silence_len=1.5) 
+
+    # Create initial segments between silence points
+    chunks = []
+    last_end = 0.0
+    MIN_CHUNK_DURATION_SEC = 2.5 # Define the minimum duration threshold
+    for silence_start, silence_end in silences:
+        start_sec = silence_start
+        end_sec = silence_end
+        duration = start_sec - last_end
+        if duration >= MIN_CHUNK_DURATION_SEC:  # Use the threshold variable
+            chunks.append((last_end, start_sec))
+        last_end = end_sec # Use the end of the silence as the start for the next potential chunk
+
+    # Add final segment if needed
+    if last_end < duration_sec:
+        # Ensure the final segment isn't too short either
+        final_segment_start = last_end
+        final_segment_end = duration_sec
+        if (final_segment_end - final_segment_start) >= MIN_CHUNK_DURATION_SEC: # Use the threshold variable here too
+            chunks.append((final_segment_start, final_segment_end))
+        # else: # Optional: handle very short final segments if needed
+        #     print(f"Skipping very short final segment: {final_segment_end - final_segment_start:.2f}s")
+
+
+    # Second pass: Split segments longer than 10 minutes
+    final_chunks_times = []
+    for start_sec, end_sec in chunks:
+        current_start = start_sec
+        while (end_sec - current_start) > MAX_CHUNK_SECONDS:
+            final_chunks_times.append((current_start, current_start + MAX_CHUNK_SECONDS))
+            current_start += MAX_CHUNK_SECONDS
+        # Add the remaining part of the chunk (or the whole chunk if it was shorter than MAX_CHUNK_SECONDS)
+        if end_sec > current_start: # Ensure there's actually a remaining part
+            final_chunks_times.append((current_start, end_sec))
 
-    try:
-        # Ensure output directory exists
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        # Load audio file (pydub uses ffmpeg here)
+    if not final_chunks_times:
+        return []
+
+    # The file is split at each chunk's start, so the silence between two chunks
+    # stays at the end of the earlier one (and any leading/trailing silence in the
+    # first/last chunk).
+    speech_starts = [0.0] + [start_sec for start_sec, _ in final_chunks_times[1:]]
+    chunk_starts = []
+    for start_sec, next_start in zip(speech_starts, speech_starts[1:] + [duration_sec]):
+        chunk_starts.append(start_sec)
+        # A long silence carried at the end must not push a chunk past the cap
+        while next_start - chunk_starts[-1] > MAX_CHUNK_SECONDS:
+            chunk_starts.append(chunk_starts[-1] + MAX_CHUNK_SECONDS)
+    for extension, segment_format, codec_args, reencodes in CHUNK_ENCODINGS:
+        # Escape '%' so titles in the directory name cannot inject extra pattern fields
+        chunk_pattern = os.path.join(chunks_dir.replace('%', '%%'), f"%02d{extension}")
+        workers = min(len(chunk_starts), os.cpu_count() or 1) if reencodes else 1
+        if workers > 1:
+            # Encoding is CPU-bound: one ffmpeg per chunk keeps every core busy
+            commands = _chunk_encode_commands(audio_path, chunk_starts, chunk_pattern, codec_args)
+        else:
+            # Stream copy is I/O-bound: cut every chunk in one linear read with the segment muxer
+            commands = [_segment_command(audio_path, chunk_starts, chunk_pattern, segment_format, codec_args)]
         try:
-            audio = AudioSegment.from_file(audio_path)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Each worker only waits on its ffmpeg process, so threads suffice
+                list(executor.map(_run_ffmpeg, commands))
+            break
+        except subprocess.CalledProcessError as e:
+            # e.g. an ffmpeg build without libopus; fall back to the next encoding
+            print(f"Error exporting {extension} chunks of {audio_path}: {e.stderr.decode('utf-8', errors='ignore')}")
         except Exception as e:
-            print(f"Error loading audio file {audio_path}: {e}")
-            return [] # Exit early if loading fails
-
-        # Detect silence and get timestamps
-        # Note: detect_silence already has its own suppression logic
-        silences = detect_silence(audio_path, min_silence_len=1.5) 
-
-        # Create initial segments between silence points
-        chunks = []
-        last_end = 0.0
-        MIN_CHUNK_DURATION_SEC = 2.5 # Define the minimum duration threshold
-        for silence_start, silence_end in silences:
-            # Convert to seconds if needed (pydub uses ms)
-            start_sec = silence_start
-            end_sec = silence_end
-            duration = start_sec - last_end
-            if duration >= MIN_CHUNK_DURATION_SEC:  # Use the threshold variable
-                chunks.append((last_end, start_sec))
-            last_end = end_sec # Use the end of the silence as the start for the next potential chunk
-
-        # Add final segment if needed
-        if last_end < audio.duration_seconds:
-            # Ensure the final segment isn't too short either
-            final_segment_start = last_end
-            final_segment_end = audio.duration_seconds
-            if (final_segment_end - final_segment_start) >= MIN_CHUNK_DURATION_SEC: # Use the threshold variable here too
-                chunks.append((final_segment_start, final_segment_end))
-            # else: # Optional: handle very short final segments if needed
-            #     print(f"Skipping very short final segment: {final_segment_end - final_segment_start:.2f}s")
-
-
-        # Second pass: Split segments longer than 10 minutes
-        final_chunks_times = []
-        MAX_LEN_SEC = 600  # 10 minutes in seconds
-        for start_sec, end_sec in chunks:
-            current_start = start_sec
-            while (end_sec - current_start) > MAX_LEN_SEC:
-                final_chunks_times.append((current_start, current_start + MAX_LEN_SEC))
-                current_start += MAX_LEN_SEC
-            # Add the remaining part of the chunk (or the whole chunk if it was shorter than MAX_LEN_SEC)
-            if end_sec > current_start: # Ensure there's actually a remaining part
-                final_chunks_times.append((current_start, end_sec))
-
-
-        # Export each segment as m4a file and collect paths
-        chunk_paths = []
-        audio_base_name = Path(audio_path).stem # Get filename without extension
-        for i, (start_sec, end_sec) in enumerate(final_chunks_times):
-            segment = audio[start_sec * 1000:end_sec * 1000] # pydub uses milliseconds
-            chunk_filename = f"{audio_base_name}_chunk_{i+1:02d}.m4a"
-            chunk_output_path = os.path.join(output_dir, chunk_filename)
-            try:
-                # pydub uses ffmpeg here for exporting
-                segment.export(chunk_output_path, format="ipod") # ipod corresponds to m4a/aac
-                chunk_paths.append(chunk_output_path)
-                print(f"Exported chunk: {chunk_output_path}")
-            except Exception as e:
-                print(f"Error exporting chunk {chunk_output_path}: {e}")
+            print(f"Error exporting chunks of {audio_path}: {e}")
+            return []
+    else:
+        return []
 
-        return chunk_paths # Return the paths list
+    # Collect the chunk paths in order
+    chunk_paths = []
+    for i in range(len(chunk_starts)):
+        chunk_output_path = os.path.join(chunks_dir, f"{i+1:02d}{extension}")
+        if os.path.exists(chunk_output_path):
+            chunk_paths.append(chunk_output_path)
+            print(f"Exported chunk: {chunk_output_path}")
+
+    return chunk_paths # Return the paths list
+
+
+def _segment_command(audio_path, chunk_starts, chunk_pattern, segment_format, codec_args):
+    """
+    Builds one ffmpeg command writing every chunk through the segment muxer.
+
+    Args:
+        audio_path (str): Path to the input audio file.
+        chunk_starts (list): Start time in seconds of each chunk, the first being 0.
+        chunk_pattern (str): Output path pattern with a %02d chunk number field.
+        segment_format (str): Muxer used for each chunk file.
+        codec_args (list): ffmpeg codec arguments.
+
+    Returns:
+        list: The command line.
+    """
+    command = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-i', audio_path,
+        '-map', '0:a', *codec_args,
+        '-f', 'segment', '-segment_format', segment_format,
+        '-segment_start_number', '1',
+        '-reset_timestamps', '1',
+    ]
+    if len(chunk_starts) > 1:
+        command += ['-segment_times', ",".join(f"{start_sec:.3f}" for start_sec in chunk_starts[1:])]
+    command.append(chunk_pattern)
+    return command
+
+
+def _chunk_encode_commands(audio_path, chunk_starts, chunk_pattern, codec_args):
+    """
+    Builds one ffmpeg command per chunk, each seeking to its own start.
+
+    Args:
+        audio_path (str): Path to the input audio file.
+        chunk_starts (list): Start time in seconds of each chunk, the first being 0.
+        chunk_pattern (str): Output path pattern with a %02d chunk number field.
+        codec_args (list): ffmpeg codec arguments.
+
+    Returns:
+        list: One command line per chunk, in chunk order.
+    """
+    commands = []
+    for i, start_sec in enumerate(chunk_starts):
+        command = ['ffmpeg', '-y', '-v', 'error', '-ss', f'{start_sec:.3f}', '-i', audio_path]
+        if i + 1 < len(chunk_starts):
+            command += ['-t', f'{chunk_starts[i + 1] - start_sec:.3f}']
+        command += ['-map', '0:a', *codec_args, chunk_pattern % (i + 1)]
+        commands.append(command)
+    return commands
 
-    finally:
-        # --- Restore original Popen ---
-        # Crucial to restore the original function to avoid affecting other parts of the script
-        # or other libraries unexpectedly.
-        subprocess.Popen = original_popen
-        # --- End Restore ---
 
-def transcribe_audio_chunk_openai(audio_chunk_path):
+def _run_ffmpeg(command):
+    """Runs an ffmpeg command, raising CalledProcessError (with stderr) on failure."""
+    subprocess.run(command, check=True, capture_output=True, creationflags=CREATION_FLAGS)
+
+
+def _transcribe_to_file(upload_paths, transcript_file_path, cache=None):
+    """
+    Transcribes audio chunks, streaming each transcript to transcript_file_path.
+
+    The file is written as <path>.part and renamed when complete, so a failed
+    run never leaves a truncated transcript behind.
+
+    Args:
+        upload_paths (list): Paths of the audio files to transcribe, in order.
+        transcript_file_path (str or None): Destination file; None skips writing.
+        cache (ResponseCache, optional): Chunk transcript cache passed to transcribe_audio_chunks.
+
+    Returns:
+        list: One transcript string per audio file, as from transcribe_audio_chunks.
+    """
+    if not transcript_file_path:
+        return transcribe_audio_chunks(upload_paths, cache=cache)
+    part_path = f"{transcript_file_path}.part"
+    try:
+        with open(part_path, "w", encoding="utf-8") as transcript_file:
+            transcripts = transcribe_audio_chunks(upload_paths, transcript_file=transcript_file, cache=cache)
+        os.replace(part_path, transcript_file_path)
+    except BaseException:
+        try:
+            os.unlink(part_path)
+        except OSError:
+            pass
+        raise
+    print(f"Transcript saved to: {transcript_file_path}")
+    return transcripts
+
+
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Returns the OpenAI client shared by all transcription calls, creating it on first use.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions) alive
+    between chunks instead of rebuilding it for every request. The pool keeps
+    one warm connection per transcription worker.
+
+    Returns:
+        OpenAI: The shared client. It reads OPENAI_API_KEY from the environment.
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                # Build the limits with the SDK's own HTTP library rather than importing it directly
+                limits_type = type(DEFAULT_CONNECTION_LIMITS)
+                limits = limits_type(max_connections=MAX_TRANSCRIPTION_WORKERS,
+                                     max_keepalive_connections=MAX_TRANSCRIPTION_WORKERS,
+                                     keepalive_expiry=DEFAULT_CONNECTION_LIMITS.keepalive_expiry)
+                _openai_client = OpenAI(http_client=DefaultHttpxClient(limits=limits))
+    return _openai_client
+
+def transcribe_audio_chunk_openai(audio_chunk_path, client=None):
     """
     Transcribes an audio chunk using OpenAI's GPT-4o-transcribe model via the official SDK.
 
     Args:
-        audio_chunk_path (str): Path to the audio chunk file (.m4a).
+        audio_chunk_path (str): Path to the audio chunk file (.ogg or .m4a).
+        client (OpenAI, optional): Client to send the request with. Defaults to the
+                                   shared client from get_openai_client().
 
     Returns:
         str: Transcribed text or None if transcription failed.
     """
     # OpenAI client will automatically use the OPENAI_API_KEY environment variable
     try:
-        client = OpenAI()
+        if client is None:
+            client = get_openai_client()
         
         # Open the audio file
         with open(audio_chunk_path, "rb") as audio_file:
+            # Pass the open file (not a Path or bytes) so the multipart body is streamed
+            # from disk, with an explicit content type instead of a mimetypes guess
+            file_name = os.path.basename(audio_chunk_path)
+            content_type = AUDIO_CONTENT_TYPES.get(Path(file_name).suffix.lower(), "application/octet-stream")
             # Use the OpenAI SDK to transcribe the audio
             response = client.audio.transcriptions.create(
-                model="gpt-4o-transcribe",
-                file=audio_file,
+                model=TRANSCRIPTION_MODEL,
+                file=(file_name, audio_file, content_type),
             )
             
             # The response is already the text content when using response_format="text"
@@ -389,6 +821,62 @@ def transcribe_audio_chunk_openai(audio_chunk_path):
         print(f"Exception during transcription: {e}")
         return None
 
+def transcribe_audio_chunks(chunk_paths, client=None, transcript_file=None, cache=None):
+    """
+    Transcribes audio chunks concurrently, returning the texts in chunk order.
+
+    Each chunk is an independent HTTP round trip, so up to
+    MAX_TRANSCRIPTION_WORKERS requests are kept in flight at once.
+
+    Args:
+        chunk_paths (list): Paths of the audio chunk files, in playback order.
+        client (OpenAI, optional): Client shared by all requests. Defaults to the
+                                   shared client from get_openai_client().
+        transcript_file (file, optional): Text file each transcript is written to as
+                                          soon as it and all earlier chunks are done.
+        cache (ResponseCache, optional): Cache of transcripts keyed on the chunk file's
+                                         content; hits skip the API call.
+
+    Returns:
+        list: One transcript string per chunk. Failed chunks are replaced by a
+              "[Transcription failed for ...]" marker line.
+    """
+    if not chunk_paths:
+        return []
+    if client is None:
+        client = get_openai_client()
+    total = len(chunk_paths)
+
+    def transcribe(indexed_path):
+        i, chunk_path = indexed_path
+        print(f"Processing chunk {i+1}/{total}: {chunk_path}")
+        cache_key = None
+        if cache is not None:
+            try:
+                cache_key = make_file_cache_key(TRANSCRIPTION_MODEL, chunk_path)
+            except OSError:
+                pass
+            cached = cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                print(f"Using cached transcription for chunk {i+1}/{total}")
+                return cached[0]
+        transcript_text = transcribe_audio_chunk_openai(chunk_path, client)
+        if transcript_text:
+            if cache_key:
+                cache.set(cache_key, transcript_text, 0, 0)
+            return transcript_text
+        print(f"Warning: Transcription failed for chunk {chunk_path}")
+        return f"[Transcription failed for {os.path.basename(chunk_path)}]\n"
+
+    # map() yields results in submission order, so the transcript stays in sequence
+    transcripts = []
+    with ThreadPoolExecutor(max_workers=min(MAX_TRANSCRIPTION_WORKERS, total)) as executor:
+        for transcript_text in executor.map(transcribe, enumerate(chunk_paths)):
+            transcripts.append(transcript_text)
+            if transcript_file is not None:
+                transcript_file.write(transcript_text)
+    return transcripts
+
 def download_youtube_audio(video_url, output_path, cookie_path=None):
     """
     Downloads the audio track from a YouTube video URL as an M4A file.
@@ -402,23 +890,110 @@ def download_youtube_audio(video_url, output_path, cookie_path=None):
     Returns:
         bool: True if download was successful, False otherwise.
     """
-    output_dir = os.path.dirname(output_path)
-    output_filename_no_ext = Path(output_path).stem
-    
-    # Ensure output directory exists
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    return download_youtube_audio_batch([(video_url, output_path)], cookie_path=cookie_path)[0]
+
+
+def download_youtube_audio_batch(downloads, cookie_path=None):
+    """
+    Downloads the audio tracks of several YouTube videos with a single yt-dlp instance.
+
+    Sharing one YoutubeDL avoids rebuilding its extractors, cookie jar and HTTP
+    session for every video.
+
+    Args:
+        downloads (list): (video_url, output_path) pairs, with the same meaning as the
+                          arguments of download_youtube_audio.
+        cookie_path (str, optional): Path to the cookie file to use for authentication. Defaults to None.
+
+    Returns:
+        list: One bool per download, True if that download was successful.
+    """
+    try:
+        with ExitStack() as stack:
+            download = _make_downloader(stack, cookie_path)
+            return [download(video_url, output_path) for video_url, output_path in downloads]
+    except Exception as e:
+        print(f"An unexpected error occurred during download: {e}")
+        return [False] * len(downloads)
+
+
+def _make_downloader(stack, cookie_path=None):
+    """
+    Builds a download function that shares one lazily created yt-dlp instance.
+
+    Audio that is already on disk is reported without touching yt-dlp, so a
+    fully cached batch never pays for building a YoutubeDL (option parsing,
+    extractor setup, cookie jar).
+
+    Args:
+        stack (contextlib.ExitStack): Closes the yt-dlp instance when the caller is done.
+        cookie_path (str, optional): Path to the cookie file to use for authentication. Defaults to None.
+
+    Returns:
+        callable: download(video_url, output_path) -> bool. Not thread-safe; call it
+                  from one thread at a time.
+    """
+    ydl = None
+
+    def download(video_url, output_path):
+        nonlocal ydl
+        # Check if the target file already exists (after potential conversion)
+        if _audio_already_downloaded(output_path):
+            print(f"Audio file already exists: {output_path}")
+            return True
+        if ydl is None:
+            ydl = stack.enter_context(yt_dlp.YoutubeDL(_youtube_audio_options(cookie_path)))
+        return _download_audio_with(ydl, video_url, output_path)
+
+    return download
+
+
+def _audio_already_downloaded(output_path):
+    """
+    Checks whether a previous run left a usable audio file at output_path.
+
+    Files of at most MIN_AUDIO_FILE_BYTES are treated as truncated leftovers and
+    deleted so yt-dlp does not mistake them for a finished download.
+
+    Args:
+        output_path (str): Expected path of the downloaded audio.
+
+    Returns:
+        bool: True if the audio can be reused.
+    """
+    try:
+        if os.path.getsize(output_path) > MIN_AUDIO_FILE_BYTES:
+            return True
+        print(f"Discarding truncated audio file: {output_path}")
+        os.remove(output_path)
+    except OSError:
+        pass
+    return False
 
+
+def _youtube_audio_options(cookie_path=None):
+    """
+    Builds the yt-dlp options used for audio downloads.
+
+    Args:
+        cookie_path (str, optional): Path to the cookie file to use for authentication. Defaults to None.
+
+    Returns:
+        dict: Options for yt_dlp.YoutubeDL. The output template is set per download.
+    """
     # yt-dlp options
-    # We specify the output directory and filename template separately
-    # We request the best audio format and convert it to m4a
+    # We prefer YouTube's AAC/m4a stream: FFmpegExtractAudio then only remuxes it
+    # (stream copy) instead of decoding and re-encoding the whole track
     ydl_opts = {
-        'format': 'bestaudio/best',
-        'outtmpl': os.path.join(output_dir, f'{output_filename_no_ext}.%(ext)s'), # Template for yt-dlp
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
         'postprocessors': [{
             'key': 'FFmpegExtractAudio',
             'preferredcodec': 'm4a', # Specify m4a codec
-            'preferredquality': '128', # Lowered bitrate to 128kbps for smaller files while retaining good quality
+            'preferredquality': '64', # Only used when a non-AAC source must be re-encoded; speech needs no more
+            'nopostoverwrites': True,
         }],
+        'keepvideo': False,
+        'concurrent_fragment_downloads': CONCURRENT_FRAGMENT_DOWNLOADS,
         'quiet': False, # Set to True for less output
         'no_warnings': True,
         'noprogress': False, # Set to True to disable progress bar
@@ -431,33 +1006,53 @@ def download_youtube_audio(video_url, output_path, cookie_path=None):
         print(f"Using cookie file: {cookie_path}")
     elif cookie_path:
         print(f"Warning: Cookie file specified but not found at {cookie_path}. Proceeding without cookies.")
+    return ydl_opts
+
+
+def _download_audio_with(ydl, video_url, output_path):
+    """
+    Downloads one video's audio with an existing yt-dlp instance.
+
+    Args:
+        ydl (yt_dlp.YoutubeDL): Instance built from _youtube_audio_options().
+        video_url (str): The URL of the YouTube video.
+        output_path (str): The full path (including filename and .m4a extension)
+                           where the audio will be saved.
+
+    Returns:
+        bool: True if download was successful, False otherwise.
+    """
+    output_dir = os.path.dirname(output_path)
+    output_filename_no_ext = Path(output_path).stem
+    
+    # Ensure output directory exists
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     print(f"Attempting to download audio from: {video_url}")
     print(f"Saving to: {output_path}") # The final path after conversion
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # Check if the target file already exists (after potential conversion)
-            if os.path.exists(output_path):
-                 print(f"Audio file already exists: {output_path}")
+        # We specify the output directory and filename template separately.
+        # '%' is escaped so the title is not read as a template field.
+        template_name = output_filename_no_ext.replace('%', '%%')
+        ydl.params['outtmpl']['default'] = os.path.join(output_dir, f'{template_name}.%(ext)s')
+
+        # yt-dlp handles the renaming based on postprocessor settings
+        error_code = ydl.download([video_url]) 
+        if error_code == 0:
+             # Verify the final expected file exists after postprocessing
+             if os.path.exists(output_path):
+                 print(f"Audio downloaded and converted successfully: {output_path}")
                  return True
+             else:
+                 # This might happen if the downloaded extension wasn't correctly handled or conversion failed
+                 print(f"Download seemed successful, but expected output file not found: {output_path}")
+                 # Optional: Look for intermediate files if needed for debugging
+                 return False
+        else:
+            print(f"yt-dlp download failed with error code: {error_code}")
+            return False
             
-            # yt-dlp handles the renaming based on postprocessor settings
-            error_code = ydl.download([video_url]) 
-            if error_code == 0:
-                 # Verify the final expected file exists after postprocessing
-                 if os.path.exists(output_path):
-                     print(f"Audio downloaded and converted successfully: {output_path}")
-                     return True
-                 else:
-                     # This might happen if the downloaded extension wasn't correctly handled or conversion failed
-                     print(f"Download seemed successful, but expected output file not found: {output_path}")
-                     # Optional: Look for intermediate files if needed for debugging
-                     return False
-            else:
-                print(f"yt-dlp download failed with error code: {error_code}")
-                return False
-                
     except yt_dlp.utils.DownloadError as e:
         print(f"Error downloading audio: {e}")
         # Check if the error message indicates an authentication issue
@@ -481,7 +1076,7 @@ if __name__ == "__main__":
     output_subdir.mkdir(parents=True, exist_ok=True)
 
     # Sanitize the title first
-    safe_file_title = re.sub(r'[\\/*?:"<>|]', '_', test_title) # Corrected regex and sanitization
+    safe_file_title = test_title.translate(_FILENAME_TRANSLATION)
 
     # Define the path for the final transcript file using the sanitized title
     final_transcript_path = output_subdir / f"{safe_file_title}_transcript.txt"
@@ -501,15 +1096,10 @@ if __name__ == "__main__":
         cleanup_intermediate_files=PERFORM_CLEANUP 
     )
 
-    if result_transcript:
-        print("\n--- Combined Placeholder Transcript ---")
-        print(result_transcript)
-        # Save the result to the file
-        try:
-            with open(final_transcript_path, 'w', encoding='utf-8') as f:
-                 f.write(result_transcript)
-            print(f"\nPlaceholder transcript saved to: {final_transcript_path}")
-        except IOError as e:
-            print(f"\nError saving transcript file: {e}")
+    if result_transcript and result_transcript[0]:
+        print("\n--- Combined Transcript ---")
+        print(result_transcript[0])
+        # get_transcript_with_ai_stt has already written the file
+        print(f"\nTranscript saved to: {final_transcript_path}")
     else:
         print("\nTranscription process failed.")
\ No newline at end of file
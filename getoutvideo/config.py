@@ -39,6 +39,11 @@ class ProcessingConfig:
     model_name: str = "gpt-4o-mini"
     output_language: str = "English"
     styles: Optional[List[str]] = field(default_factory=lambda: ["Summary"])  # Default to Summary style only
+    max_concurrent_requests: int = 4  # Upper bound on in-flight OpenAI requests
+    max_concurrent_jobs: int = 4  # Upper bound on (video, style) jobs processed at once
+    response_cache_enabled: bool = True  # Reuse cached chunk responses from output_dir/.openai_cache
+    chunks_per_request: int = 1  # Chunks packed into one OpenAI request (1 = no batching)
+    max_retries: int = 5  # Retries with exponential backoff on rate limits, 5xx and connection errors
     
     def __post_init__(self):
         """Validate configuration values."""
@@ -46,6 +51,14 @@ class ProcessingConfig:
             raise ValueError("chunk_size must be > 0")
         if not self.output_language:
             raise ValueError("output_language cannot be empty")
+        if self.max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be >= 1")
+        if self.max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be >= 1")
+        if self.chunks_per_request < 1:
+            raise ValueError("chunks_per_request must be >= 1")
+        if self.max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
 
 
 @dataclass
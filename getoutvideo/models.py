@@ -5,12 +5,16 @@ This module defines the core data structures used throughout the API for
 representing video transcripts, processing results, and related metadata.
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
+# __slots__ drop the per-instance __dict__; dataclass(slots=...) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class VideoTranscript:
     """Represents a video transcript with metadata."""
     
@@ -29,7 +33,7 @@ class VideoTranscript:
             self.word_count = len(self.transcript_text.split())
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProcessingResult:
     """Represents the result of AI processing on a video transcript."""
     
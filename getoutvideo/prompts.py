@@ -5,6 +5,8 @@ This module contains the same refinement prompts as the original application,
 providing various text processing styles for the API.
 """
 
+import functools
+
 text_refinement_prompts = {
     "Balanced and Detailed": """Turn the following unorganized text into a well-structured, readable format while retaining EVERY detail, context, and nuance of the original content.
     Refine the text to improve clarity, grammar, and coherence WITHOUT cutting, summarizing, or omitting any information.
@@ -65,6 +67,12 @@ text_refinement_prompts = {
     Text:"""
 }
 
+# Prepended to a style prompt when several chunks are sent in a single request.
+# The model is asked to mark each part of its answer so the response can be split.
+batch_output_instructions = """The user message is split into {count} parts. Each part starts with a line of the form ---CHUNK n---.
+Apply the instructions below to each part independently and in order.
+Start the output for each part with a line ---OUTPUT n--- using the same n, and do not write anything before the first marker."""
+
 
 def get_available_styles():
     """Get list of available processing styles."""
@@ -88,4 +96,25 @@ def get_prompt_for_style(style_name: str) -> str:
         available = ", ".join(get_available_styles())
         raise ValueError(f"Unknown style '{style_name}'. Available styles: {available}")
     
-    return text_refinement_prompts[style_name]
\ No newline at end of file
+    return text_refinement_prompts[style_name]
+
+
+@functools.lru_cache(maxsize=None)
+def get_formatted_prompt(style_name: str, output_language: str) -> str:
+    """
+    Get the prompt for a style with the output language filled in.
+    
+    The result is cached, so every video processed with the same style and
+    language reuses one prompt string.
+    
+    Args:
+        style_name: Name of the processing style
+        output_language: Target language for the output
+        
+    Returns:
+        str: The formatted prompt
+        
+    Raises:
+        ValueError: If style_name is not found
+    """
+    return get_prompt_for_style(style_name).replace("[Language]", output_language)
@@ -0,0 +1,175 @@
+"""
+On-disk cache of AI responses for the GetOutVideo API.
+
+A refined chunk is fully determined by the model name, the formatted style
+prompt and the chunk text, so responses are stored under a BLAKE2b hash of
+those three values. Re-running a job (for example after a partial failure)
+then skips the API round trip for every chunk that already succeeded.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Name of the cache directory created inside the output directory
+CACHE_DIR_NAME = ".openai_cache"
+
+# Bytes read at a time when hashing a file for make_file_cache_key
+FILE_HASH_BLOCK_SIZE = 1 << 16
+
+# (response_text, input_tokens, output_tokens)
+CachedResponse = Tuple[str, int, int]
+
+
+def make_cache_key(model_name: str, prompt: str, chunk: str) -> str:
+    """
+    Build the cache key for one chunk request.
+
+    Args:
+        model_name: Name of the OpenAI model
+        prompt: Formatted style prompt sent with the chunk
+        chunk: Chunk text
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    return make_cache_key_factory(model_name, prompt)(chunk)
+
+
+def make_cache_key_factory(model_name: str, prompt: str) -> Callable[[str], str]:
+    """
+    Build a function computing cache keys for chunks sent with one prompt.
+
+    The model name and prompt are hashed once; each key only hashes the
+    chunk on top of that state. Keys match make_cache_key.
+
+    Args:
+        model_name: Name of the OpenAI model
+        prompt: Formatted style prompt sent with every chunk
+
+    Returns:
+        Callable[[str], str]: Function mapping chunk text to its cache key
+    """
+    prefix = hashlib.blake2b(digest_size=16)
+    for part in (model_name, prompt):
+        prefix.update(part.encode("utf-8"))
+        prefix.update(b"\0")
+
+    def cache_key(chunk: str) -> str:
+        digest = prefix.copy()
+        digest.update(chunk.encode("utf-8"))
+        digest.update(b"\0")
+        return digest.hexdigest()
+
+    return cache_key
+
+
+def make_file_cache_key(model_name: str, file_path: str) -> str:
+    """
+    Build the cache key for a request whose input is a file, such as an audio chunk.
+
+    The file is hashed in FILE_HASH_BLOCK_SIZE blocks, so it is never held in memory whole.
+
+    Args:
+        model_name: Name of the OpenAI model
+        file_path: Path of the file sent with the request
+
+    Returns:
+        str: Hex digest identifying the request
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(FILE_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dumps(entry: Any) -> bytes:
+    """Serialize a cache entry to UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(entry)
+    return json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a cache entry, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResponseCache:
+    """
+    Stores AI responses as one small JSON file per cache key.
+
+    Cache errors never interrupt processing: unreadable entries are treated
+    as misses and failed writes are ignored.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries (created on first write)
+        """
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            CachedResponse: Cached (text, input_tokens, output_tokens), or None on a miss
+        """
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                entry = _loads(f.read())
+            return entry["text"], entry["input_tokens"], entry["output_tokens"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key: str, text: str, input_tokens: int, output_tokens: int) -> None:
+        """
+        Store a response, replacing any existing entry atomically.
+
+        Args:
+            key: Cache key from make_cache_key
+            text: Response text
+            input_tokens: Input tokens billed for the original request
+            output_tokens: Output tokens billed for the original request
+        """
+        entry = {"text": text, "input_tokens": input_tokens, "output_tokens": output_tokens}
+        # Serialize up front so the entry is written in one call
+        payload = _dumps(entry)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(temp_path, self._entry_path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            # Silently ignore cache write errors to prevent them from breaking processing
+            pass
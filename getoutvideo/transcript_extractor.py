@@ -6,7 +6,7 @@ the original GUI application's TranscriptExtractionThread class.
 """
 
 import os
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Tuple
 from pytubefix import Playlist, YouTube
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound, VideoUnplayable
 
@@ -96,8 +96,10 @@ class TranscriptExtractor:
             safe_status_callback(status_callback, 
                                f"Processing {total_videos} video(s).")
             
-            # Extract transcripts
-            transcripts = []
+            # Extract transcripts; videos that need the AI fallback are queued and
+            # transcribed together afterwards, so their audio downloads overlap
+            extracted: List[Optional[VideoTranscript]] = []
+            ai_fallback_jobs: List[Tuple[int, str, str]] = []
             for index, video_url in enumerate(video_urls_to_process, 1):
                 if self._cancelled:
                     safe_status_callback(status_callback, "Extraction cancelled by user.")
@@ -106,18 +108,29 @@ class TranscriptExtractor:
                 print(f"DEBUG: Processing video {index}/{total_videos}: {video_url}")
                 
                 transcript = self._extract_single_video(video_url, index, index, 
-                                                       total_videos, status_callback)
+                                                       total_videos, status_callback, ai_fallback_jobs)
+                extracted.append(transcript)
                 
                 if transcript:
                     print(f"DEBUG: Successfully extracted transcript for video {index}: {transcript.title[:50]}...")
-                    transcripts.append(transcript)
+                elif ai_fallback_jobs and ai_fallback_jobs[-1][0] == index:
+                    print(f"DEBUG: Queued video {index} for AI STT fallback")
                 else:
                     print(f"DEBUG: Failed to extract transcript for video {index}")
                 
-                # Update progress
-                progress_percent = int((index / total_videos) * 100)
+                # Update progress; queued videos count once they are transcribed
+                progress_percent = int(((index - len(ai_fallback_jobs)) / total_videos) * 100)
                 safe_progress_callback(progress_callback, progress_percent)
             
+            if ai_fallback_jobs and not self._cancelled:
+                for (index, _, _), transcript in zip(ai_fallback_jobs,
+                                                     self._transcribe_with_ai_fallback(ai_fallback_jobs,
+                                                                                       total_videos,
+                                                                                       status_callback)):
+                    extracted[index - 1] = transcript
+                safe_progress_callback(progress_callback, int((len(extracted) / total_videos) * 100))
+            
+            transcripts = [transcript for transcript in extracted if transcript]
             print(f"DEBUG: Extraction completed - {len(transcripts)} total transcripts extracted")
             safe_status_callback(status_callback, f"Extraction completed. {len(transcripts)} transcripts extracted.")
             return transcripts
@@ -169,9 +182,66 @@ class TranscriptExtractor:
         except Exception as e:
             raise YouTubeAccessError(f"Failed to parse URL {url}: {str(e)}") from e
     
+    def _transcribe_with_ai_fallback(self, jobs: List[Tuple[int, str, str]], total_videos: int,
+                                     status_callback: Optional[Callable[[str], None]] = None
+                                     ) -> List[Optional[VideoTranscript]]:
+        """
+        Transcribe queued videos with the AI STT fallback.
+        
+        The videos go through audio_transcriber.get_transcripts_with_ai_stt, which
+        downloads the next video's audio while the current one is transcribed.
+        
+        Args:
+            jobs: ``(current_index, video_url, video_title)`` tuples queued by _extract_single_video
+            total_videos: Total number of videos being processed
+            status_callback: Optional callback for status messages
+            
+        Returns:
+            List[Optional[VideoTranscript]]: One transcript per job, in job order;
+                None where the fallback failed
+        """
+        print(f"DEBUG: Attempting AI STT fallback for {len(jobs)} video(s)...")
+        try:
+            results = audio_transcriber.get_transcripts_with_ai_stt(
+                [(video_url, video_title, None) for _, video_url, video_title in jobs],
+                self.config.transcript_config.cookie_path,
+                self.config.transcript_config.cleanup_temp_files
+            )
+        except Exception as ai_e:
+            print(f"DEBUG: AI STT fallback failed with exception: {str(ai_e)}")
+            safe_status_callback(status_callback, f"Error during AI STT fallback: {str(ai_e)}")
+            return [None] * len(jobs)
+        
+        transcripts: List[Optional[VideoTranscript]] = []
+        for (current_index, video_url, video_title), result in zip(jobs, results):
+            if result and result[0]:  # Check if we got a tuple with transcript
+                transcript_text, audio_duration_minutes = result
+                openai_cost = audio_duration_minutes * self.WHISPER_COST_PER_MINUTE
+                print(f"DEBUG: AI STT fallback successful, length: {len(transcript_text)}")
+                print(f"DEBUG: Audio duration: {audio_duration_minutes:.2f} min, Cost: ${openai_cost:.4f}")
+                safe_status_callback(status_callback,
+                                   f"Successfully obtained transcript via AI STT for video {current_index}/{total_videos}. "
+                                   f"Duration: {audio_duration_minutes:.2f} min, Cost: ${openai_cost:.4f}")
+                transcripts.append(VideoTranscript(
+                    title=video_title,
+                    url=video_url,
+                    transcript_text=transcript_text,
+                    source="ai_stt",
+                    audio_duration_minutes=audio_duration_minutes,
+                    openai_cost=openai_cost
+                ))
+            else:
+                print(f"DEBUG: AI STT fallback returned no transcript")
+                safe_status_callback(status_callback,
+                                   f"AI STT fallback failed or returned no transcript for video {current_index}/{total_videos}.")
+                transcripts.append(None)
+        return transcripts
+    
     def _extract_single_video(self, video_url: str, original_index: int, 
                             current_index: int, total_videos: int,
-                            status_callback: Optional[Callable[[str], None]] = None) -> Optional[VideoTranscript]:
+                            status_callback: Optional[Callable[[str], None]] = None,
+                            ai_fallback_jobs: Optional[List[Tuple[int, str, str]]] = None
+                            ) -> Optional[VideoTranscript]:
         """
         Extract transcript from a single video.
         
@@ -181,9 +251,13 @@ class TranscriptExtractor:
             current_index: Current processing index (1-based)
             total_videos: Total number of videos being processed
             status_callback: Optional callback for status messages
+            ai_fallback_jobs: If given, a video that needs the AI STT fallback is
+                appended as ``(current_index, video_url, video_title)`` for
+                _transcribe_with_ai_fallback instead of being transcribed here
             
         Returns:
             VideoTranscript: Extracted transcript or None if extraction failed
+                or the video was queued for the AI fallback
         """
         print(f"DEBUG: _extract_single_video called for {video_url}")
         
@@ -275,6 +349,10 @@ class TranscriptExtractor:
                                        f"Standard transcript unavailable for video {current_index}/{total_videos} "
                                        f"({type(e).__name__}). Attempting AI STT fallback...")
                     
+                    if ai_fallback_jobs is not None:
+                        ai_fallback_jobs.append((current_index, video_url, video_title))
+                        return None
+                    
                     try:
                         print(f"DEBUG: Attempting AI STT fallback...")
                         # Use the AI STT fallback
@@ -7,7 +7,27 @@ including filename sanitization and text chunking functionality.
 
 import re
 import os
-from typing import List, Optional, Callable
+import asyncio
+import concurrent.futures
+from typing import Any, Coroutine, Iterator, List, Optional, Callable, TypeVar
+
+try:
+    import uvloop  # type: ignore[import-not-found,unused-ignore]
+except ImportError:
+    uvloop = None  # type: ignore[assignment,unused-ignore]
+
+T = TypeVar("T")
+
+# Characters invalid in Windows/Unix filenames, mapped to underscores
+_INVALID_FILENAME_CHARS = str.maketrans({c: '_' for c in '<>:"/\\|?*' + ''.join(map(chr, range(0x20)))})
+
+# Runs of spaces/underscores, collapsed to a single underscore
+_SEPARATOR_RUNS = re.compile(r'[_\s]+')
+
+# Reserved Windows device names
+_RESERVED_NAMES = frozenset({'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
+                             'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
+                             'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'})
 
 
 def sanitize_filename(filename: str, max_length: int = 100) -> str:
@@ -27,22 +47,17 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     if not filename:
         return "untitled"
     
-    # Remove invalid characters for Windows/Unix filesystems
-    invalid_chars = r'[<>:"/\\|?*\x00-\x1f]'
-    sanitized = re.sub(invalid_chars, '_', filename)
+    # Replace invalid characters for Windows/Unix filesystems
+    sanitized = filename.translate(_INVALID_FILENAME_CHARS)
     
     # Replace multiple spaces/underscores with single underscore
-    sanitized = re.sub(r'[_\s]+', '_', sanitized)
+    sanitized = _SEPARATOR_RUNS.sub('_', sanitized)
     
     # Remove leading/trailing spaces and dots
     sanitized = sanitized.strip(' ._')
     
     # Ensure we don't create reserved Windows names
-    reserved_names = {'CON', 'PRN', 'AUX', 'NUL', 'COM1', 'COM2', 'COM3', 'COM4',
-                      'COM5', 'COM6', 'COM7', 'COM8', 'COM9', 'LPT1', 'LPT2',
-                      'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'}
-    
-    if sanitized.upper() in reserved_names:
+    if sanitized.upper() in _RESERVED_NAMES:
         sanitized = f"_{sanitized}"
     
     # Limit length
@@ -56,7 +71,8 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     return sanitized
 
 
-def split_text_into_chunks(text: str, chunk_size: int, min_chunk_size: int = 0) -> List[str]:
+def split_text_into_chunks(text: str, chunk_size: int, min_chunk_size: int = 0,
+                           words: Optional[List[str]] = None) -> List[str]:
     """
     Split text into chunks based on word count.
     
@@ -67,6 +83,7 @@ def split_text_into_chunks(text: str, chunk_size: int, min_chunk_size: int = 0)
         text: The text to split into chunks
         chunk_size: Maximum number of words per chunk
         min_chunk_size: Minimum number of words for a chunk (smaller chunks get merged)
+        words: Optional pre-split words of ``text`` to avoid splitting again
         
     Returns:
         List[str]: List of text chunks
@@ -77,34 +94,42 @@ def split_text_into_chunks(text: str, chunk_size: int, min_chunk_size: int = 0)
     if chunk_size <= 0:
         return [text]
     
-    words = text.split()
+    if words is None:
+        words = text.split()
     if len(words) <= chunk_size:
         return [text]
     
-    chunks = []
-    current_chunk = []
+    chunks = list(iter_text_chunks(text, chunk_size, words=words))
     
-    for word in words:
-        current_chunk.append(word)
-        
-        if len(current_chunk) >= chunk_size:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
+    # If final chunk is too small and we have previous chunks, merge with last chunk
+    remaining_words = len(words) % chunk_size
+    if min_chunk_size > 0 and 0 < remaining_words < min_chunk_size and len(chunks) > 1:
+        remaining_chunk = chunks.pop()
+        chunks[-1] = chunks[-1] + ' ' + remaining_chunk
     
-    # Handle remaining words
-    if current_chunk:
-        remaining_chunk = ' '.join(current_chunk)
+    return chunks
+
+
+def iter_text_chunks(text: str, chunk_size: int, words: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Lazily yield chunks of at most ``chunk_size`` words.
+    
+    Each chunk is built from a slice of the word list, so only one chunk
+    string exists at a time unless the caller keeps them.
+    
+    Args:
+        text: The text to split into chunks
+        chunk_size: Maximum number of words per chunk
+        words: Optional pre-split words of ``text`` to avoid splitting again
         
-        # If final chunk is too small and we have previous chunks, merge with last chunk
-        if (min_chunk_size > 0 and len(current_chunk) < min_chunk_size and 
-            chunks and len(chunks) > 0):
-            # Merge with previous chunk
-            last_chunk = chunks.pop()
-            chunks.append(last_chunk + ' ' + remaining_chunk)
-        else:
-            chunks.append(remaining_chunk)
+    Yields:
+        str: The next text chunk
+    """
+    if words is None:
+        words = text.split()
     
-    return chunks
+    for start in range(0, len(words), chunk_size):
+        yield ' '.join(words[start:start + chunk_size])
 
 
 def safe_progress_callback(callback: Optional[Callable[[int], None]], 
@@ -152,4 +177,49 @@ def ensure_directory_exists(directory_path: str) -> None:
         OSError: If directory cannot be created
     """
     if not os.path.exists(directory_path):
-        os.makedirs(directory_path, exist_ok=True)
\ No newline at end of file
+        os.makedirs(directory_path, exist_ok=True)
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Runs the coroutine on a new event loop, using uvloop when it is installed
+    (``pip install getoutvideo[fast]``). When called from inside a running
+    loop (e.g. Jupyter), the new loop runs in a worker thread instead of
+    re-entering the caller's loop. The global event loop policy is never
+    changed.
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    run = asyncio.run if uvloop is None else uvloop.run
+    
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run(coro)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run, coro).result()
+
+
+async def run_in_thread(func: Callable[..., T], *args) -> T:
+    """
+    Run a blocking function in the event loop's default thread pool.
+    
+    Equivalent to ``asyncio.to_thread`` (which needs Python 3.9+) for
+    positional arguments.
+    
+    Args:
+        func: The blocking function to call
+        *args: Positional arguments for ``func``
+        
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, func, *args)
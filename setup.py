@@ -44,12 +44,12 @@ setup(
         "openai>=1.75.0",
         "python-dotenv",
         "yt-dlp",
-        "pydub",
         "ffmpeg-python",
     ],
     extras_require={
         "dev": ["pytest>=7.0", "black", "flake8", "mypy", "twine", "build"],
         "test": ["pytest>=7.0", "pytest-cov"],
+        "fast": ["uvloop>=0.18; sys_platform != 'win32'", "orjson"],
     },
     keywords="youtube transcript ai openai video-processing gpt",
     project_urls={
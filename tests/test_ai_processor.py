@@ -0,0 +1,284 @@
+"""
+Tests for the AI processor.
+"""
+
+import re
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from getoutvideo.ai_processor import AIProcessor
+from getoutvideo.config import APIConfig, ProcessingConfig
+from getoutvideo.models import VideoTranscript
+from getoutvideo.config_urls import UNIT_TEST_URL
+
+
+class FakeCompletions:
+    """Stand-in for ``client.chat.completions`` that echoes the chunk text."""
+
+    def __init__(self, delay: float = 0.0, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.ignore_batch_markers = False
+        self.prompts = []
+        self.system_prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        self.system_prompts.append(messages[0]["content"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("boom")
+
+        if "---CHUNK 1---" in prompt:
+            parts = re.split(r"---CHUNK \d+---\n", prompt)[1:]
+            if self.ignore_batch_markers:
+                content = " ".join(f"refined {part.strip()}" for part in parts)
+            else:
+                content = "\n".join(f"---OUTPUT {n}---\nrefined {part.strip()}"
+                                    for n, part in enumerate(parts, 1))
+        else:
+            content = f"refined {prompt.rsplit(chr(10) * 2, 1)[-1]}"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        )
+
+
+class FakeAsyncOpenAI:
+    """Minimal async OpenAI client exposing ``chat.completions``."""
+
+    def __init__(self, completions: FakeCompletions, **client_kwargs):
+        self.chat = SimpleNamespace(completions=completions)
+        completions.client_kwargs = client_kwargs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        http_client = self.chat.completions.client_kwargs.get("http_client")
+        if http_client is not None:
+            await http_client.aclose()
+        return False
+
+
+@pytest.fixture
+def transcript():
+    return VideoTranscript(
+        title="Test Video",
+        url=UNIT_TEST_URL,
+        transcript_text=" ".join(f"w{i}" for i in range(12)),
+        source="youtube_api"
+    )
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = FakeCompletions()
+    monkeypatch.setattr("getoutvideo.ai_processor.openai.AsyncOpenAI",
+                        lambda **kwargs: FakeAsyncOpenAI(completions, **kwargs))
+    return completions
+
+
+def make_processor(**processing_kwargs) -> AIProcessor:
+    config = APIConfig(
+        openai_api_key="test-key",
+        processing_config=ProcessingConfig(styles=["Summary"], **processing_kwargs)
+    )
+    return AIProcessor(config)
+
+
+class TestProcessTranscripts:
+    """Test end-to-end processing with a fake OpenAI client."""
+
+    def test_chunks_written_in_order(self, transcript, completions, tmp_path):
+        """Concurrent chunk responses are concatenated in chunk order."""
+        completions.delay = 0.01
+        processor = make_processor(chunk_size=3, max_concurrent_requests=2)
+        results = processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(results) == 1
+        result = results[0]
+        assert result.chunk_count == 4
+        assert result.openai_input_tokens == 40
+        assert result.openai_output_tokens == 20
+        assert result.openai_cost == pytest.approx((40 * 0.15 + 20 * 0.60) / 1000000)
+        assert completions.max_in_flight <= 2
+        assert completions.client_kwargs["max_retries"] == 5
+        assert completions.client_kwargs["http_client"] is not None
+
+        content = open(result.output_file_path, encoding="utf-8").read()
+        positions = [content.index(f"refined w{i} ") for i in (0, 3, 6)]
+        assert positions == sorted(positions)
+        assert content.startswith("# Test Video")
+
+    def test_chunk_status_messages(self, transcript, completions, tmp_path):
+        """Per-chunk status messages are reported when a callback is given."""
+        messages = []
+        processor = make_processor(chunk_size=3)
+        processor.process_transcripts([transcript], str(tmp_path), status_callback=messages.append)
+
+        assert "Chunk 4/4 processed for style 'Summary'." in messages
+        assert "Chunk 1/4 tokens: input=10, output=5" in messages
+
+    def test_style_prompt_sent_as_system_message(self, transcript, completions, tmp_path):
+        """The formatted style prompt is one shared system message; chunks go in the user message."""
+        processor = make_processor(chunk_size=3, output_language="German")
+        processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(set(completions.system_prompts)) == 1
+        assert "German" in completions.system_prompts[0]
+        assert "[Language]" not in completions.system_prompts[0]
+        assert "w0 w1 w2" in completions.prompts
+
+    def test_failed_chunk_skips_style(self, transcript, completions, tmp_path):
+        """A failing chunk drops the style's output instead of writing a partial file."""
+        completions.fail_on = "w6"
+        processor = make_processor(chunk_size=3)
+        results = processor.process_transcripts([transcript], str(tmp_path))
+
+        assert results == []
+        assert not list(tmp_path.glob("*.md"))
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_results_follow_input_order(self, transcript, completions, tmp_path):
+        """Jobs run concurrently but results keep (transcript, style) order."""
+        second = VideoTranscript(title="Second Video", url=UNIT_TEST_URL,
+                                 transcript_text="alpha beta", source="youtube_api")
+        processor = make_processor(chunk_size=3)
+        processor.config.processing_config.styles = ["Summary", "Educational"]
+        progress = []
+        results = processor.process_transcripts([transcript, second], str(tmp_path),
+                                                progress_callback=progress.append)
+
+        assert [(r.video_transcript.title, r.style_name) for r in results] == [
+            ("Test Video", "Summary"), ("Test Video", "Educational"),
+            ("Second Video", "Summary"), ("Second Video", "Educational"),
+        ]
+        assert progress[-1] == 100
+        assert len({r.created_at for r in results}) == 1
+
+    def test_rerun_served_from_cache(self, transcript, completions, tmp_path):
+        """A second run reuses cached chunk responses without calling the API."""
+        processor = make_processor(chunk_size=3)
+        first = processor.process_transcripts([transcript], str(tmp_path))
+        calls_after_first_run = len(completions.prompts)
+
+        second = processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(completions.prompts) == calls_after_first_run
+        assert second[0].openai_input_tokens == 0
+        assert (open(second[0].output_file_path, encoding="utf-8").read()
+                == open(first[0].output_file_path, encoding="utf-8").read())
+
+    def test_cache_disabled(self, transcript, completions, tmp_path):
+        """With the cache disabled every run calls the API."""
+        processor = make_processor(chunk_size=3, response_cache_enabled=False)
+        processor.process_transcripts([transcript], str(tmp_path))
+        processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(completions.prompts) == 8
+        assert not (tmp_path / ".openai_cache").exists()
+
+    def test_identical_requests_share_one_call(self, transcript, completions, tmp_path):
+        """A chunk repeated in another video is sent once while it is in flight."""
+        completions.delay = 0.01
+        repeat = VideoTranscript(title="Repeat", url=UNIT_TEST_URL,
+                                 transcript_text=transcript.transcript_text, source="youtube_api")
+        processor = make_processor(chunk_size=3, response_cache_enabled=False)
+        results = processor.process_transcripts([transcript, repeat], str(tmp_path))
+
+        assert len(completions.prompts) == 4
+        # Each shared call is billed to whichever job reached the API first
+        assert sum(r.openai_input_tokens for r in results) == 40
+        assert processor._in_flight_requests is None
+
+    def test_batched_chunks(self, transcript, completions, tmp_path):
+        """Several chunks share one request and are split back in order."""
+        processor = make_processor(chunk_size=3, chunks_per_request=2)
+        results = processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(completions.prompts) == 2
+        content = open(results[0].output_file_path, encoding="utf-8").read()
+        assert "refined w0 w1 w2\n\nrefined w3 w4 w5\n\nrefined w6 w7 w8" in content
+        assert "---OUTPUT" not in content
+
+    def test_batches_respect_token_budget(self, transcript, completions, tmp_path, monkeypatch):
+        """Chunks whose estimated tokens exceed the budget are sent on their own."""
+        monkeypatch.setattr("getoutvideo.ai_processor.BATCH_TOKEN_BUDGET", 3)
+        processor = make_processor(chunk_size=3, chunks_per_request=2)
+        processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(completions.prompts) == 4
+
+    def test_unsplittable_batch_falls_back(self, transcript, completions, tmp_path):
+        """A batched answer without markers is retried chunk by chunk."""
+        completions.ignore_batch_markers = True
+        processor = make_processor(chunk_size=3, chunks_per_request=2)
+        results = processor.process_transcripts([transcript], str(tmp_path))
+
+        assert len(completions.prompts) == 6
+        content = open(results[0].output_file_path, encoding="utf-8").read()
+        assert content.endswith("refined w6 w7 w8\n\nrefined w9 w10 w11")
+        # Both batched calls and the four retries are billed
+        assert results[0].openai_input_tokens == 60
+        assert results[0].openai_output_tokens == 30
+
+
+class TestHelpers:
+    """Test module-level helpers."""
+
+    def test_gpt5_uses_default_temperature(self):
+        from getoutvideo.ai_processor import _get_model_options
+        assert dict(_get_model_options("gpt-5")) == {}
+        assert dict(_get_model_options("gpt-4o-mini")) == {"temperature": 0.7}
+        assert _get_model_options("gpt-4o-mini") is _get_model_options("gpt-4o-mini")
+
+    def test_split_batch_output(self):
+        from getoutvideo.ai_processor import _split_batch_output
+        text = "---OUTPUT 1---\nfirst\n---OUTPUT 2---\nsecond\n"
+        assert _split_batch_output(text, 2) == ["first", "second"]
+        assert _split_batch_output(text, 3) is None
+        assert _split_batch_output("no markers", 1) is None
+
+    def test_unknown_model_priced_as_gpt5(self):
+        processor = make_processor()
+        assert processor._calculate_openai_cost(1000000, 1000000, "unknown") == pytest.approx(11.25)
+
+    def test_cache_key_factory_matches_cache_key(self):
+        from getoutvideo.response_cache import make_cache_key, make_cache_key_factory
+        cache_key_for = make_cache_key_factory("gpt-4o-mini", "prompt")
+        assert cache_key_for("chunk") == make_cache_key("gpt-4o-mini", "prompt", "chunk")
+        assert cache_key_for("chunk") != cache_key_for("other chunk")
+
+    def test_file_cache_key_follows_content(self, tmp_path):
+        from getoutvideo.response_cache import make_file_cache_key
+        first, second = tmp_path / "a.ogg", tmp_path / "b.ogg"
+        first.write_bytes(b"x" * 100000)
+        second.write_bytes(b"x" * 100000)
+        assert make_file_cache_key("m", str(first)) == make_file_cache_key("m", str(second))
+        assert make_file_cache_key("m", str(first)) != make_file_cache_key("other", str(first))
+        second.write_bytes(b"y")
+        assert make_file_cache_key("m", str(first)) != make_file_cache_key("m", str(second))
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_response_cache_roundtrip(self, tmp_path, monkeypatch, use_orjson):
+        from getoutvideo import response_cache
+        if not use_orjson:
+            monkeypatch.setattr(response_cache, "orjson", None)
+        elif response_cache.orjson is None:
+            pytest.skip("orjson not installed")
+        cache = response_cache.ResponseCache(str(tmp_path))
+        cache.set("key", "привет", 3, 4)
+        assert cache.get("key") == ("привет", 3, 4)
+        assert cache.get("missing") is None
@@ -89,6 +89,19 @@ class TestGetOutVideoAPI:
         assert isinstance(styles, list)
         assert len(styles) > 0
         assert "Summary" in styles
+    
+    @patch('getoutvideo.ai_processor.AIProcessor.process_transcripts')
+    def test_process_with_ai_keeps_processor(self, mock_ai_process):
+        """Test a new processing config is applied without replacing the processor."""
+        mock_ai_process.return_value = []
+        api = GetOutVideoAPI("test-key")
+        processor = api.ai_processor
+        config = ProcessingConfig(styles=["Summary"], output_language="German")
+        
+        api.process_with_ai([], "/output", config)
+        
+        assert api.ai_processor is processor
+        assert processor.config.processing_config is config
 
 
 class TestConvenienceFunctions:
@@ -148,7 +161,29 @@ class TestEnvironmentLoading:
     @patch.dict('os.environ', {}, clear=True)
     def test_load_from_env_missing_keys(self):
         """Test loading from environment with missing keys."""
+        import getoutvideo
         from getoutvideo import load_api_from_env
+        getoutvideo._load_env_config.cache_clear()
         
         with pytest.raises(ConfigurationError):
-            load_api_from_env()
\ No newline at end of file
+            load_api_from_env()
+    
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'env-openai-key', 'LANGUAGE': 'French'}, clear=True)
+    def test_load_from_env_cached(self):
+        """Test the environment is read once and its language reaches the processor."""
+        import getoutvideo
+        getoutvideo._load_env_config.cache_clear()
+        try:
+            with patch('getoutvideo.load_config_from_env', wraps=getoutvideo.load_config_from_env) as load:
+                api = getoutvideo.load_api_from_env()
+                other = getoutvideo.load_api_from_env()
+            
+            assert load.call_count == 1
+            assert api.ai_processor.config.processing_config.output_language == "French"
+            
+            # Instances do not share mutable configuration
+            assert other is not api
+            api.config.processing_config.chunk_size = 123
+            assert other.ai_processor.config.processing_config.chunk_size != 123
+        finally:
+            getoutvideo._load_env_config.cache_clear()
@@ -0,0 +1,464 @@
+"""
+Tests for the AI speech-to-text fallback.
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+audio_transcriber = pytest.importorskip("getoutvideo.audio_transcriber")
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path, monkeypatch):
+    """Keep the chunk transcript cache out of the real user cache directory."""
+    cache_root = tmp_path / "user_cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_root))
+    monkeypatch.setenv("LOCALAPPDATA", str(cache_root))
+    return cache_root
+
+
+class FakeTranscriptions:
+    """Stand-in for ``client.audio.transcriptions`` that echoes the file name."""
+
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.uploads = []
+
+    def create(self, model, file, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.uploads.append((file[0], file[2], hasattr(file[1], "read")))
+        try:
+            name = file[0]
+            # Later chunks answer first so ordering relies on map(), not timing
+            time.sleep(0.05 / (int(name.split("_")[-1].split(".")[0]) + 1))
+            if self.fail_on and self.fail_on in name:
+                raise RuntimeError("boom")
+            return SimpleNamespace(text=f"text of {name} ")
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def make_chunks(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"audio_chunk_{i + 1:02d}.m4a"
+        path.write_bytes(path.name.encode())
+        paths.append(str(path))
+    return paths
+
+
+class TestTranscribeAudioChunks:
+    """Test concurrent chunk transcription."""
+
+    def test_results_keep_chunk_order(self, tmp_path):
+        """Chunks are transcribed concurrently but joined in playback order."""
+        transcriptions = FakeTranscriptions()
+        client = SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions))
+        paths = make_chunks(tmp_path, 4)
+
+        results = audio_transcriber.transcribe_audio_chunks(paths, client)
+
+        assert results == [f"text of audio_chunk_{i:02d}.m4a " for i in range(1, 5)]
+        assert transcriptions.max_in_flight > 1
+        assert ("audio_chunk_01.m4a", "audio/mp4", True) in transcriptions.uploads
+
+    def test_failed_chunk_marked(self, tmp_path):
+        """A failed chunk is replaced by a marker instead of dropping the transcript."""
+        client = SimpleNamespace(audio=SimpleNamespace(
+            transcriptions=FakeTranscriptions(fail_on="_02")))
+        paths = make_chunks(tmp_path, 3)
+
+        results = audio_transcriber.transcribe_audio_chunks(paths, client)
+
+        assert results[1] == "[Transcription failed for audio_chunk_02.m4a]\n"
+        assert results[2] == "text of audio_chunk_03.m4a "
+
+    def test_cached_chunks_skip_api(self, tmp_path):
+        """A chunk whose bytes were transcribed before is served from the cache."""
+        from getoutvideo.response_cache import ResponseCache
+        cache = ResponseCache(str(tmp_path / "cache"))
+        paths = make_chunks(tmp_path, 2)
+        first = FakeTranscriptions()
+        audio_transcriber.transcribe_audio_chunks(
+            paths, SimpleNamespace(audio=SimpleNamespace(transcriptions=first)), cache=cache)
+
+        second = FakeTranscriptions()
+        results = audio_transcriber.transcribe_audio_chunks(
+            paths, SimpleNamespace(audio=SimpleNamespace(transcriptions=second)), cache=cache)
+
+        assert len(first.uploads) == 2
+        assert second.uploads == []
+        assert results == ["text of audio_chunk_01.m4a ", "text of audio_chunk_02.m4a "]
+
+    def test_failed_chunk_not_cached(self, tmp_path):
+        from getoutvideo.response_cache import ResponseCache
+        cache = ResponseCache(str(tmp_path / "cache"))
+        client = SimpleNamespace(audio=SimpleNamespace(
+            transcriptions=FakeTranscriptions(fail_on="_01")))
+        audio_transcriber.transcribe_audio_chunks(make_chunks(tmp_path, 1), client, cache=cache)
+        assert not (tmp_path / "cache").exists()
+
+    def test_no_chunks(self):
+        assert audio_transcriber.transcribe_audio_chunks([]) == []
+
+
+class TestOpenAIClient:
+    """Test the shared transcription client."""
+
+    def test_client_created_once_with_sized_pool(self, monkeypatch):
+        """One client is shared, with a connection pool sized to the worker count."""
+        created = []
+        monkeypatch.setattr(audio_transcriber, "_openai_client", None)
+        monkeypatch.setattr(audio_transcriber, "DefaultHttpxClient",
+                            lambda limits: created.append(limits) or "http-client")
+        monkeypatch.setattr(audio_transcriber, "OpenAI",
+                            lambda http_client: SimpleNamespace(http_client=http_client))
+
+        client = audio_transcriber.get_openai_client()
+
+        assert audio_transcriber.get_openai_client() is client
+        assert client.http_client == "http-client"
+        assert len(created) == 1
+        assert created[0].max_connections == audio_transcriber.MAX_TRANSCRIPTION_WORKERS
+        assert created[0].max_keepalive_connections == audio_transcriber.MAX_TRANSCRIPTION_WORKERS
+
+
+class TestBatchTranscription:
+    """Test the download/transcription pipeline."""
+
+    def test_downloads_overlap_transcription(self, tmp_path, monkeypatch):
+        """The next video downloads while the current one is transcribed; order is kept."""
+        events = []
+
+        def fake_download(ydl, video_url, output_path):
+            events.append(f"download {video_url}")
+            return True
+
+        def fake_transcribe(video_url, audio_path, output_dir, downloaded, cleanup, transcript_path):
+            time.sleep(0.02)
+            events.append(f"transcribe {video_url}")
+            return f"text {video_url}", 1.0
+
+        monkeypatch.setattr(audio_transcriber, "_download_audio_with", fake_download)
+        monkeypatch.setattr(audio_transcriber, "_transcribe_downloaded_audio", fake_transcribe)
+        jobs = [(f"url{i}", f"Video {i}", str(tmp_path / f"v{i}.txt")) for i in range(3)]
+
+        results = audio_transcriber.get_transcripts_with_ai_stt(jobs, None)
+
+        assert results == [(f"text url{i}", 1.0) for i in range(3)]
+        assert events.index("download url1") < events.index("transcribe url0")
+        assert events.index("download url2") < events.index("transcribe url1")
+
+    def test_failing_job_does_not_abort_batch(self, tmp_path, monkeypatch):
+        """A download that raises marks that job failed; later jobs still run."""
+        def fake_download(ydl, video_url, output_path):
+            if video_url == "url0":
+                raise RuntimeError("network down")
+            return True
+
+        monkeypatch.setattr(audio_transcriber, "_download_audio_with", fake_download)
+        monkeypatch.setattr(audio_transcriber, "_transcribe_downloaded_audio",
+                            lambda video_url, *args: (f"text {video_url}", 1.0))
+        jobs = [(f"url{i}", f"Video {i}", str(tmp_path / f"v{i}.txt")) for i in range(2)]
+
+        results = audio_transcriber.get_transcripts_with_ai_stt(jobs, None)
+
+        assert results == [(None, None), ("text url1", 1.0)]
+
+    def test_title_sanitized_for_audio_path(self, tmp_path):
+        output_dir, audio_path = audio_transcriber._resolve_audio_paths(
+            "url", 'a/b:c?"d"', str(tmp_path / "transcript.txt"))
+        assert output_dir == tmp_path
+        assert audio_path.name == "a_b_c__d_.m4a"
+
+    def test_missing_transcript_path_uses_video_temp_dir(self, tmp_path, monkeypatch):
+        """Without a transcript path audio goes to one stable directory per video URL."""
+        monkeypatch.setattr(audio_transcriber.tempfile, "gettempdir", lambda: str(tmp_path))
+        output_dir, audio_path = audio_transcriber._resolve_audio_paths("url1", "Video", None)
+        same_dir, _ = audio_transcriber._resolve_audio_paths("url1", "Video", None)
+        other_dir, _ = audio_transcriber._resolve_audio_paths("url2", "Video", None)
+
+        assert output_dir.parent == tmp_path / audio_transcriber.AUDIO_TEMP_DIR_NAME
+        assert output_dir.is_dir()
+        assert same_dir == output_dir
+        assert other_dir != output_dir
+        assert audio_path.name == "Video.m4a"
+
+    def test_rerun_without_transcript_path_hits_cache(self, tmp_path, monkeypatch, user_cache_dir):
+        """The extractor's call shape (no transcript path, cleanup on) re-uses cached transcripts."""
+        transcriptions = FakeTranscriptions()
+        monkeypatch.setattr(audio_transcriber.tempfile, "gettempdir", lambda: str(tmp_path / "tmp"))
+        monkeypatch.setattr(audio_transcriber, "get_openai_client",
+                            lambda: SimpleNamespace(audio=SimpleNamespace(transcriptions=transcriptions)))
+        monkeypatch.setattr(audio_transcriber, "download_youtube_audio",
+                            lambda url, path, cookie_path=None: open(path, "wb").write(b"audio") > 0)
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 60.0)
+
+        first = audio_transcriber.get_transcript_with_ai_stt("url", "audio_1", None, None, True)
+        second = audio_transcriber.get_transcript_with_ai_stt("url", "audio_1", None, None, True)
+
+        assert first == second == ("text of audio_1.m4a ", 1.0)
+        assert len(transcriptions.uploads) == 1
+        assert (user_cache_dir / audio_transcriber.TRANSCRIPT_CACHE_DIR_NAME).is_dir()
+
+    def test_cleanup_removes_video_temp_dir(self, tmp_path, monkeypatch):
+        """Cleanup deletes the temp directory created for a call without a transcript path."""
+        monkeypatch.setattr(audio_transcriber.tempfile, "gettempdir", lambda: str(tmp_path))
+        monkeypatch.setattr(audio_transcriber, "download_youtube_audio",
+                            lambda url, path, cookie_path=None: open(path, "wb").close() or True)
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 60.0)
+        monkeypatch.setattr(audio_transcriber, "transcribe_audio_chunks", lambda paths, **kwargs: ["text"])
+
+        result = audio_transcriber.get_transcript_with_ai_stt("url", "Video", None, None, True)
+
+        assert result == ("text", 1.0)
+        assert list((tmp_path / audio_transcriber.AUDIO_TEMP_DIR_NAME).iterdir()) == []
+
+    def test_invalid_path_yields_none(self, monkeypatch):
+        monkeypatch.setattr(audio_transcriber, "_download_audio_with",
+                            lambda *args: pytest.fail("download should not run"))
+        assert audio_transcriber.get_transcripts_with_ai_stt([("url", "Video", 123)], None) == [None]
+
+
+class FakePopen:
+    """Stand-in for an ffmpeg process whose stderr yields silencedetect lines."""
+
+    lines = []
+    returncode = 0
+    command = None
+
+    def __init__(self, command, **kwargs):
+        FakePopen.command = command
+        self.stderr = iter(self.lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestDetectSilence:
+    """Test parsing of ffmpeg's silencedetect log."""
+
+    def test_intervals_parsed_from_stream(self, monkeypatch):
+        FakePopen.lines = [
+            "Input #0, mov,mp4,m4a from 'in.m4a':\n",
+            "[silencedetect @ 0x1] silence_start: 4.5\n",
+            "[silencedetect @ 0x1] silence_end: 6.25 | silence_duration: 1.75\n",
+            "[silencedetect @ 0x1] silence_start: 9\n",
+        ]
+        monkeypatch.setattr(audio_transcriber.subprocess, "Popen", FakePopen)
+
+        assert audio_transcriber.detect_silence("in.m4a") == [(4.5, 6.25)]
+        filters = FakePopen.command[FakePopen.command.index("-filter_complex") + 1]
+        assert filters.index("aformat") < filters.index("silencedetect")
+
+
+class TestTranscribeDownloadedAudio:
+    """Test the segment-and-transcribe stage."""
+
+    def test_short_audio_uploaded_whole(self, tmp_path, monkeypatch):
+        """Audio under the upload limits skips segmentation."""
+        audio_path = tmp_path / "short.m4a"
+        audio_path.write_bytes(b"\0" * 2048)
+        uploads = []
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 120.0)
+        monkeypatch.setattr(audio_transcriber, "audio_segmentation",
+                            lambda *args: pytest.fail("segmentation should be skipped"))
+        monkeypatch.setattr(audio_transcriber, "transcribe_audio_chunks",
+                            lambda paths, **kwargs: uploads.append(paths) or ["whole text"])
+
+        text, _ = audio_transcriber._transcribe_downloaded_audio(
+            "url", audio_path, tmp_path, True, False)
+
+        assert text == "whole text"
+        assert uploads == [[str(audio_path)]]
+
+    def test_transcript_streamed_to_file(self, tmp_path, monkeypatch):
+        """Each chunk is written to the transcript file in order; no .part is left behind."""
+        audio_path = tmp_path / "long.m4a"
+        audio_path.write_bytes(b"\0" * 2048)
+        transcript_path = tmp_path / "transcript.txt"
+        client = SimpleNamespace(audio=SimpleNamespace(transcriptions=FakeTranscriptions()))
+        monkeypatch.setattr(audio_transcriber, "get_openai_client", lambda: client)
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 3600.0)
+        monkeypatch.setattr(audio_transcriber, "audio_segmentation",
+                            lambda *args: make_chunks(tmp_path, 3))
+
+        text, _ = audio_transcriber._transcribe_downloaded_audio(
+            "url", audio_path, tmp_path, True, False, str(transcript_path))
+
+        assert transcript_path.read_text(encoding="utf-8") == text
+        assert text.index("chunk_01") < text.index("chunk_02") < text.index("chunk_03")
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_long_audio_segmented(self, tmp_path, monkeypatch):
+        audio_path = tmp_path / "long.m4a"
+        audio_path.write_bytes(b"\0" * 2048)
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 3600.0)
+        monkeypatch.setattr(audio_transcriber, "audio_segmentation", lambda *args: ["a", "b"])
+        monkeypatch.setattr(audio_transcriber, "transcribe_audio_chunks", lambda paths, **kwargs: list(paths))
+
+        text, _ = audio_transcriber._transcribe_downloaded_audio(
+            "url", audio_path, tmp_path, True, False)
+
+        assert text == "ab"
+
+    def test_cleanup_removes_audio_and_chunks(self, tmp_path, monkeypatch):
+        audio_path = tmp_path / "long.m4a"
+        audio_path.write_bytes(b"\0" * 2048)
+        chunks_dir = tmp_path / "long_chunks"
+        chunks_dir.mkdir()
+        chunks = [chunks_dir / "01.ogg", chunks_dir / "02.ogg"]
+        chunks[0].write_bytes(b"\0")
+        monkeypatch.setattr(audio_transcriber, "get_audio_duration", lambda path: 3600.0)
+        monkeypatch.setattr(audio_transcriber, "audio_segmentation",
+                            lambda *args: [str(chunk) for chunk in chunks])
+        monkeypatch.setattr(audio_transcriber, "transcribe_audio_chunks", lambda paths, **kwargs: ["text"])
+
+        audio_transcriber._transcribe_downloaded_audio("url", audio_path, tmp_path, True, True)
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestDownloadBatch:
+    """Test batch downloads through one yt-dlp instance."""
+
+    def test_one_instance_per_batch(self, tmp_path, monkeypatch):
+        """Every video is fetched by the same YoutubeDL, each with its own output template."""
+        instances = []
+
+        class FakeYoutubeDL:
+            def __init__(self, params):
+                self.params = dict(params, outtmpl={"default": "%(title)s.%(ext)s"})
+                instances.append(self)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def download(self, urls):
+                path = self.params["outtmpl"]["default"].replace("%(ext)s", "m4a")
+                open(path.replace("%%", "%"), "wb").close()
+                return 0
+
+        monkeypatch.setattr(audio_transcriber.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+        downloads = [("url1", str(tmp_path / "one.m4a")), ("url2", str(tmp_path / "100% two.m4a"))]
+
+        assert audio_transcriber.download_youtube_audio_batch(downloads) == [True, True]
+        assert len(instances) == 1
+        assert instances[0].params["concurrent_fragment_downloads"] == 4
+        assert (tmp_path / "100% two.m4a").exists()
+
+    def test_existing_audio_skips_yt_dlp(self, tmp_path, monkeypatch):
+        """Cached audio is reused without building a YoutubeDL; truncated files are discarded."""
+        monkeypatch.setattr(audio_transcriber.yt_dlp, "YoutubeDL",
+                            lambda params: pytest.fail("yt-dlp should not be created"))
+        cached = tmp_path / "cached.m4a"
+        cached.write_bytes(b"\0" * 2048)
+        truncated = tmp_path / "truncated.m4a"
+        truncated.write_bytes(b"\0")
+
+        assert audio_transcriber.download_youtube_audio_batch([("url", str(cached))]) == [True]
+        assert not audio_transcriber._audio_already_downloaded(str(truncated))
+        assert not truncated.exists()
+
+
+class TestPairSilenceEvents:
+    """Test pairing of silencedetect events."""
+
+    def test_out_of_order_events_sorted(self):
+        events = [(9.0, "end"), (1.0, "start"), (7.5, "start"), (2.0, "end")]
+        assert audio_transcriber.pair_silence_events(events) == [(1.0, 2.0), (7.5, 9.0)]
+
+    def test_unmatched_events_dropped(self):
+        events = [(0.5, "end"), (1.0, "start"), (3.0, "start"), (4.0, "end"), (8.0, "start")]
+        assert audio_transcriber.pair_silence_events(events) == [(3.0, 4.0)]
+
+
+class TestAudioSegmentation:
+    """Test silence-based segmentation with ffmpeg mocked out."""
+
+    def test_chunks_cut_in_one_pass(self, tmp_path, monkeypatch):
+        """On one core all chunks come from one segment muxer run, split at chunk starts."""
+        monkeypatch.setattr(audio_transcriber.os, "cpu_count", lambda: 1)
+        commands = self.fake_ffmpeg(tmp_path, monkeypatch)
+
+        chunk_paths = audio_transcriber.audio_segmentation("in.m4a", str(tmp_path))
+
+        assert [p.replace(str(tmp_path), "") for p in chunk_paths] == ["/in_chunks/01.ogg", "/in_chunks/02.ogg"]
+        assert len(commands) == 2
+        segment_command = commands[1]
+        assert segment_command[segment_command.index("-segment_times") + 1] == "12.000"
+        assert segment_command[segment_command.index("-c:a") + 1] == "libopus"
+
+    def test_reencoded_chunks_exported_in_parallel(self, tmp_path, monkeypatch):
+        """With several cores each Opus chunk is encoded by its own ffmpeg."""
+        monkeypatch.setattr(audio_transcriber.os, "cpu_count", lambda: 4)
+        commands = self.fake_ffmpeg(tmp_path, monkeypatch)
+
+        chunk_paths = audio_transcriber.audio_segmentation("in.m4a", str(tmp_path))
+
+        assert len(chunk_paths) == 2
+        cuts = sorted((c[c.index("-ss") + 1], os.path.basename(c[-1])) for c in commands[1:])
+        assert cuts == [("0.000", "01.ogg"), ("12.000", "02.ogg")]
+        first = next(c for c in commands[1:] if c[-1].endswith("01.ogg"))
+        assert first[first.index("-t") + 1] == "12.000"
+
+    def test_long_trailing_silence_split_at_cap(self, tmp_path, monkeypatch):
+        """Silence kept at a chunk's end is split so no chunk exceeds MAX_CHUNK_SECONDS."""
+        monkeypatch.setattr(audio_transcriber.os, "cpu_count", lambda: 1)
+        commands = self.fake_ffmpeg(tmp_path, monkeypatch, duration="1300.0",
+                                    silences=[(590.0, 1290.0)], chunk_count=4)
+
+        chunk_paths = audio_transcriber.audio_segmentation("in.m4a", str(tmp_path))
+
+        assert len(chunk_paths) == 4
+        segment_command = commands[1]
+        assert (segment_command[segment_command.index("-segment_times") + 1]
+                == "600.000,1200.000,1290.000")
+
+    def test_falls_back_to_stream_copy(self, tmp_path, monkeypatch):
+        """Without libopus the chunks are stream-copied to m4a in one pass."""
+        commands = self.fake_ffmpeg(tmp_path, monkeypatch, fail_on="libopus")
+
+        chunk_paths = audio_transcriber.audio_segmentation("in.m4a", str(tmp_path))
+
+        assert [p.replace(str(tmp_path), "") for p in chunk_paths] == ["/in_chunks/01.m4a", "/in_chunks/02.m4a"]
+        assert commands[-1][commands[-1].index("-c") + 1] == "copy"
+        assert "-segment_times" in commands[-1]
+
+    @staticmethod
+    def fake_ffmpeg(tmp_path, monkeypatch, fail_on=None, duration="30.0", silences=((10.0, 12.0),),
+                    chunk_count=2):
+        """Mock ffprobe/ffmpeg: by default a 30 s file with one silence from 10 s to 12 s."""
+        commands = []
+        monkeypatch.setattr(audio_transcriber, "detect_silence",
+                            lambda *args, **kwargs: list(silences))
+
+        def fake_run(command, **kwargs):
+            commands.append(command)
+            if command[0] == "ffprobe":
+                return SimpleNamespace(stdout=f"{duration}\n")
+            if fail_on in command:
+                raise audio_transcriber.subprocess.CalledProcessError(1, command, stderr=b"no encoder")
+            extension = command[-1].rsplit(".", 1)[-1]
+            for n in range(1, chunk_count + 1):
+                (tmp_path / "in_chunks" / f"{n:02d}.{extension}").write_bytes(b"\0")
+            return SimpleNamespace(stdout=b"")
+
+        monkeypatch.setattr(audio_transcriber.subprocess, "run", fake_run)
+        return commands
@@ -35,12 +35,28 @@ class TestProcessingConfig:
         assert config.model_name == "gpt-4o-mini"
         assert config.output_language == "English"
         assert config.styles == ["Summary"]
+        assert config.max_concurrent_requests == 4
+        assert config.max_concurrent_jobs == 4
+        assert config.response_cache_enabled is True
+        assert config.chunks_per_request == 1
+        assert config.max_retries == 5
     
     def test_invalid_chunk_size(self):
         """Test validation of chunk_size."""
         with pytest.raises(ValueError, match="chunk_size must be > 0"):
             ProcessingConfig(chunk_size=0)
     
+    def test_invalid_max_concurrent_requests(self):
+        """Test validation of max_concurrent_requests."""
+        with pytest.raises(ValueError, match="max_concurrent_requests must be >= 1"):
+            ProcessingConfig(max_concurrent_requests=0)
+        with pytest.raises(ValueError, match="max_concurrent_jobs must be >= 1"):
+            ProcessingConfig(max_concurrent_jobs=0)
+        with pytest.raises(ValueError, match="chunks_per_request must be >= 1"):
+            ProcessingConfig(chunks_per_request=0)
+        with pytest.raises(ValueError, match="max_retries must be >= 0"):
+            ProcessingConfig(max_retries=-1)
+    
     def test_empty_language(self):
         """Test validation of output_language."""
         with pytest.raises(ValueError, match="output_language cannot be empty"):
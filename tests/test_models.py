@@ -0,0 +1,37 @@
+"""
+Tests for data models.
+"""
+
+import sys
+
+import pytest
+
+from getoutvideo.models import VideoTranscript
+from getoutvideo.config_urls import UNIT_TEST_URL
+
+
+class TestVideoTranscript:
+    """Test VideoTranscript defaults."""
+    
+    def test_word_count(self):
+        """Test word count matches str.split() semantics."""
+        text = "  one two\tthree\n\nfour  "
+        transcript = VideoTranscript(title="T", url=UNIT_TEST_URL,
+                                     transcript_text=text, source="youtube_api")
+        
+        assert transcript.word_count == len(text.split()) == 4
+    
+    def test_explicit_word_count_kept(self):
+        """Test a provided word count is not recalculated."""
+        transcript = VideoTranscript(title="T", url=UNIT_TEST_URL, transcript_text="a b",
+                                     source="youtube_api", word_count=10)
+        
+        assert transcript.word_count == 10
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_no_instance_dict(self):
+        """Test instances use __slots__ instead of a __dict__."""
+        transcript = VideoTranscript(title="T", url=UNIT_TEST_URL, transcript_text="a b",
+                                     source="youtube_api")
+        
+        assert not hasattr(transcript, "__dict__")
@@ -0,0 +1,70 @@
+"""
+Tests for the transcript extractor.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from youtube_transcript_api import TranscriptsDisabled
+
+from getoutvideo import transcript_extractor
+from getoutvideo.config import APIConfig, TranscriptConfig
+from getoutvideo.transcript_extractor import TranscriptExtractor
+
+
+class FakeTranscriptApi:
+    """Stand-in for YouTubeTranscriptApi where only video ``id1`` has captions."""
+
+    def fetch(self, video_id, *args):
+        if video_id == "id1":
+            return [{"text": "captions"}]
+        raise TranscriptsDisabled(video_id)
+
+    @staticmethod
+    def list_transcripts(video_id):
+        raise TranscriptsDisabled(video_id)
+
+
+class TestAIFallback:
+    """Test the AI speech-to-text fallback path."""
+
+    @pytest.fixture
+    def extractor(self, monkeypatch):
+        if transcript_extractor.audio_transcriber is None:
+            pytest.skip("audio transcriber not available")
+        urls = [f"https://www.youtube.com/watch?v=id{i}" for i in range(3)]
+        monkeypatch.setattr(transcript_extractor, "YouTube",
+                            lambda url: SimpleNamespace(title=f"Title {url[-1]}"))
+        monkeypatch.setattr(transcript_extractor, "YouTubeTranscriptApi", FakeTranscriptApi)
+        extractor = TranscriptExtractor(APIConfig(
+            openai_api_key="test-key",
+            transcript_config=TranscriptConfig(use_ai_fallback=True)
+        ))
+        monkeypatch.setattr(extractor, "_parse_url", lambda url, status_callback=None: (urls, "Playlist"))
+        return extractor
+
+    def test_fallback_videos_transcribed_as_one_batch(self, extractor, monkeypatch):
+        """Videos without captions share one pipelined batch; results keep playlist order."""
+        batches = []
+
+        def fake_batch(jobs, cookie_path, cleanup_intermediate_files):
+            batches.append([video_url for video_url, _, _ in jobs])
+            return [(f"speech {video_url[-1]}", 2.0) for video_url, _, _ in jobs]
+
+        monkeypatch.setattr(transcript_extractor.audio_transcriber, "get_transcripts_with_ai_stt", fake_batch)
+        progress = []
+
+        transcripts = extractor.extract_transcripts("playlist", progress_callback=progress.append)
+
+        assert [t.transcript_text for t in transcripts] == ["speech 0", "captions", "speech 2"]
+        assert [t.source for t in transcripts][::2] == ["ai_stt", "ai_stt"]
+        assert batches == [["https://www.youtube.com/watch?v=id0", "https://www.youtube.com/watch?v=id2"]]
+        assert progress == sorted(progress) and progress[-1] == 100
+
+    def test_failed_fallback_skips_video(self, extractor, monkeypatch):
+        monkeypatch.setattr(transcript_extractor.audio_transcriber, "get_transcripts_with_ai_stt",
+                            lambda jobs, *args: [(None, None)] * len(jobs))
+
+        transcripts = extractor.extract_transcripts("playlist")
+
+        assert [t.transcript_text for t in transcripts] == ["captions"]
@@ -3,7 +3,7 @@ Tests for utility functions.
 """
 
 import pytest
-from getoutvideo.utils import sanitize_filename, split_text_into_chunks
+from getoutvideo.utils import sanitize_filename, split_text_into_chunks, iter_text_chunks, run_coroutine_sync
 
 
 class TestSanitizeFilename:
@@ -15,6 +15,11 @@ class TestSanitizeFilename:
         assert sanitize_filename('file:name*test') == "file_name_test"
         assert sanitize_filename('path/to\\file') == "path_to_file"
     
+    def test_control_characters(self):
+        """Test control characters are replaced like other invalid characters."""
+        assert sanitize_filename("tab\there\x00nul\x1fend") == "tab_here_nul_end"
+        assert sanitize_filename('a?b|c"d') == "a_b_c_d"
+    
     def test_empty_filename(self):
         """Test empty filename handling."""
         assert sanitize_filename("") == "untitled"
@@ -84,8 +89,57 @@ class TestSplitTextIntoChunks:
         assert len(chunks) == 3
         assert len(chunks[2].split()) == 20
     
+    def test_presplit_words(self):
+        """Test that pre-split words give the same chunks as the raw text."""
+        text = " ".join(f"w{i}" for i in range(120))
+        chunks = split_text_into_chunks(text, chunk_size=50, words=text.split())
+        
+        assert chunks == split_text_into_chunks(text, chunk_size=50)
+    
     def test_empty_text(self):
         """Test empty text handling."""
         chunks = split_text_into_chunks("", chunk_size=50)
         assert len(chunks) == 1
-        assert chunks[0] == ""
\ No newline at end of file
+        assert chunks[0] == ""
+
+
+class TestIterTextChunks:
+    """Test the lazy chunk generator."""
+    
+    def test_yields_lazily(self):
+        """Test that chunks are produced one at a time."""
+        chunks = iter_text_chunks("a b c d e", chunk_size=2)
+        
+        assert next(chunks) == "a b"
+        assert list(chunks) == ["c d", "e"]
+    
+    def test_pre_split_words(self):
+        """Test that pre-split words are used instead of re-splitting the text."""
+        words = ["x", "y", "z"]
+        assert list(iter_text_chunks("ignored", chunk_size=2, words=words)) == ["x y", "z"]
+
+
+class TestRunCoroutineSync:
+    """Test running coroutines from synchronous code."""
+    
+    async def _answer(self):
+        return 42
+    
+    def test_without_uvloop(self, monkeypatch):
+        """Test the plain asyncio loop is used when uvloop is missing."""
+        monkeypatch.setattr("getoutvideo.utils.uvloop", None)
+        assert run_coroutine_sync(self._answer()) == 42
+    
+    def test_uses_uvloop_when_available(self, monkeypatch):
+        """Test uvloop.run drives the coroutine when uvloop is installed."""
+        import asyncio
+        from types import SimpleNamespace
+        calls = []
+        
+        def fake_run(coro):
+            calls.append(coro)
+            return asyncio.run(coro)
+        
+        monkeypatch.setattr("getoutvideo.utils.uvloop", SimpleNamespace(run=fake_run))
+        assert run_coroutine_sync(self._answer()) == 42
+        assert len(calls) == 1